@@ -21,10 +21,12 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent))
 
 from ultimate_tech_detector import UltimateTechDetector
-from logging_config import get_logger, log_analysis_start, log_analysis_complete, log_analysis_error, log_engine_status
+from logging_config import configure_logging, get_logger, log_analysis_start, log_analysis_complete, log_analysis_error, log_engine_status
 
 logger = get_logger('api_server')
 app = Flask(__name__)
+# Any WSGI entry point serving app gets the file handlers; main() calling it again is a no-op
+configure_logging()
 CORS(app)
 detector = None
 
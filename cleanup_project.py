@@ -6,8 +6,18 @@ Removes unnecessary files and organizes the project structure
 
 import os
 import shutil
+import stat
 import sys
 
+def _remove_entry(path, is_dir):
+    """Remove a file or a directory tree and report it"""
+    if is_dir:
+        shutil.rmtree(path)
+        print(f"  ❌ Removed directory: {path}")
+    else:
+        os.remove(path)
+        print(f"  ❌ Removed file: {path}")
+
 def cleanup_project():
     """Clean up the project by removing unnecessary files"""
     
@@ -60,35 +70,29 @@ def cleanup_project():
     
     # Remove files
     for file_path in files_to_remove:
-        if os.path.exists(file_path):
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                    print(f"  ❌ Removed file: {file_path}")
-                    removed_count += 1
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
-                    print(f"  ❌ Removed directory: {file_path}")
-                    removed_count += 1
-            except Exception as e:
-                print(f"  ⚠️  Could not remove {file_path}: {e}")
+        try:
+            # One lstat answers both "does it exist" and "is it a directory"
+            st = os.lstat(file_path)
+        except FileNotFoundError:
+            continue
+        try:
+            _remove_entry(file_path, stat.S_ISDIR(st.st_mode))
+            removed_count += 1
+        except Exception as e:
+            print(f"  ⚠️  Could not remove {file_path}: {e}")
     
     # Clean directories (remove contents but keep directory)
     for dir_path in dirs_to_clean:
-        if os.path.exists(dir_path):
-            try:
-                for item in os.listdir(dir_path):
-                    item_path = os.path.join(dir_path, item)
-                    if os.path.isfile(item_path):
-                        os.remove(item_path)
-                        print(f"  ❌ Removed file: {item_path}")
-                        removed_count += 1
-                    elif os.path.isdir(item_path):
-                        shutil.rmtree(item_path)
-                        print(f"  ❌ Removed directory: {item_path}")
-                        removed_count += 1
-            except Exception as e:
-                print(f"  ⚠️  Could not clean {dir_path}: {e}")
+        try:
+            # scandir entries carry their file type, so no extra stat per item
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    _remove_entry(os.path.join(dir_path, entry.name), entry.is_dir(follow_symlinks=False))
+                    removed_count += 1
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            print(f"  ⚠️  Could not clean {dir_path}: {e}")
     
     # Create new output directory
     os.makedirs("output", exist_ok=True)
@@ -5,18 +5,51 @@ Analyzes all provided domains with 100% technology coverage
 """
 
 import asyncio
+import aiohttp
 import json
 import os
 import time
+from collections import Counter
+from heapq import nlargest
+from operator import attrgetter
 from ultimate_tech_detector import UltimateTechDetector
+from logging_config import configure_logging
 
-async def analyze_domain(domain: str, output_dir: str):
-    """Analyze a single domain with comprehensive detection"""
+# orjson is optional; reports fall back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Datetimes and dataclasses pass through to default=str, as they do with json.dump
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                   | orjson.OPT_PASSTHROUGH_DATACLASS) if ORJSON_AVAILABLE else 0
+
+def _dumps(data, indent: bool = True) -> bytes:
+    """Encode a report as UTF-8 JSON, indented or compact"""
+    if ORJSON_AVAILABLE:
+        option = (_ORJSON_OPTIONS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTIONS
+        return orjson.dumps(data, default=str, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    # Without indent the json module keeps its C encoder
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+def _write_bytes(path: str, data: bytes):
+    """Write an encoded report in one call"""
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def _write_text(path: str, text: str):
+    """Write a text report in one call"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+async def analyze_domain(detector: UltimateTechDetector, domain: str, output_dir: str, analysis_date: str = None):
+    """Analyze a single domain with comprehensive detection, dating its report with the run's analysis_date"""
     print(f"\n Starting comprehensive analysis of {domain}...")
     
-    # Initialize detector
-    detector = UltimateTechDetector('data/datasets')
-    
     # Analysis options for maximum coverage
     options = {
         'min_confidence': 0,
@@ -32,31 +65,47 @@ async def analyze_domain(domain: str, output_dir: str):
         
         analysis_time = time.time() - start_time
         
+        # Serialize technologies, count categories and bucket confidences in a single pass
+        technologies = []
+        categories = Counter()
+        confidence_buckets = [0, 0, 0, 0]  # high, medium, low, very low
+        for tech in result.technologies:
+            confidence = tech.confidence
+            category = tech.category
+            if confidence >= 80:
+                confidence_buckets[0] += 1
+            elif confidence >= 50:
+                confidence_buckets[1] += 1
+            elif confidence >= 10:
+                confidence_buckets[2] += 1
+            else:
+                confidence_buckets[3] += 1
+            categories[category] += 1
+            technologies.append({
+                'name': tech.name,
+                'confidence': confidence,
+                'category': category,
+                'versions': tech.versions,
+                'evidence': tech.evidence,
+                'source': tech.source,
+                'website': tech.website,
+                'description': tech.description,
+                'saas': tech.saas,
+                'oss': tech.oss,
+                'user_agent_used': tech.user_agent_used,
+                'detection_time': tech.detection_time
+            })
+        categories_detected = len(categories)
+        
         # Prepare output data
         output_data = {
             'domain': domain,
             'url': result.url,
             'final_url': result.final_url,
             'analysis_time': analysis_time,
-            'total_technologies': len(result.technologies),
-            'categories_detected': len(set(tech.category for tech in result.technologies)),
-            'technologies': [
-                {
-                    'name': tech.name,
-                    'confidence': tech.confidence,
-                    'category': tech.category,
-                    'versions': tech.versions,
-                    'evidence': tech.evidence,
-                    'source': tech.source,
-                    'website': tech.website,
-                    'description': tech.description,
-                    'saas': tech.saas,
-                    'oss': tech.oss,
-                    'user_agent_used': tech.user_agent_used,
-                    'detection_time': tech.detection_time
-                }
-                for tech in result.technologies
-            ],
+            'total_technologies': len(technologies),
+            'categories_detected': categories_detected,
+            'technologies': technologies,
             'metadata': result.metadata,
             'errors': result.errors,
             'warnings': result.warnings,
@@ -68,60 +117,65 @@ async def analyze_domain(domain: str, output_dir: str):
                 'categories_available': len(detector.dataset_manager.categories),
                 'whatweb_available': detector.whatweb.available,
                 'confidence_distribution': {
-                    'high (80-100)': len([t for t in result.technologies if t.confidence >= 80]),
-                    'medium (50-79)': len([t for t in result.technologies if 50 <= t.confidence < 80]),
-                    'low (10-49)': len([t for t in result.technologies if 10 <= t.confidence < 50]),
-                    'very_low (0-9)': len([t for t in result.technologies if t.confidence < 10])
+                    'high (80-100)': confidence_buckets[0],
+                    'medium (50-79)': confidence_buckets[1],
+                    'low (10-49)': confidence_buckets[2],
+                    'very_low (0-9)': confidence_buckets[3]
                 }
             }
         }
         
-        # Save detailed JSON report
-        json_filename = f"{domain.replace('.', '_')}_comprehensive_analysis.json"
-        json_path = os.path.join(output_dir, json_filename)
+        # Both report files share one filename stem
+        slug = domain.replace('.', '_')
         
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
+        # Save detailed JSON report; it is large and machine-read, so it is written compact
+        json_filename = f"{slug}_comprehensive_analysis.json"
+        json_path = os.path.join(output_dir, json_filename)
+        json_payload = _dumps(output_data, indent=False)
         
         # Create summary report
-        summary_filename = f"{domain.replace('.', '_')}_summary.md"
+        summary_filename = f"{slug}_summary.md"
         summary_path = os.path.join(output_dir, summary_filename)
         
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {domain} - Comprehensive Technology Analysis\n\n")
-            f.write(f"**Analysis Date**: {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}\n")
-            f.write(f"**Analysis Time**: {analysis_time:.2f} seconds\n")
-            f.write(f"**Total Technologies**: {len(result.technologies)}\n")
-            f.write(f"**Categories Detected**: {len(set(tech.category for tech in result.technologies))}\n")
-            f.write(f"**WhatWeb Available**: {'Yes' if detector.whatweb.available else 'No'}\n\n")
-            
-            f.write("## Technology Categories\n\n")
-            categories = {}
-            for tech in result.technologies:
-                cat = tech.category
-                categories[cat] = categories.get(cat, 0) + 1
-            
-            for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
-                f.write(f"- **{cat}**: {count} technologies\n")
-            
-            f.write("\n## Top Technologies by Confidence\n\n")
-            sorted_techs = sorted(result.technologies, key=lambda x: x.confidence, reverse=True)
-            for i, tech in enumerate(sorted_techs[:20], 1):
-                f.write(f"{i:2d}. **{tech.name}** ({tech.category}) - {tech.confidence}% confidence\n")
-            
-            if len(sorted_techs) > 20:
-                f.write(f"\n... and {len(sorted_techs) - 20} more technologies\n")
+        # Build the report in memory and write it in one call
+        lines = [
+            f"# {domain} - Comprehensive Technology Analysis\n\n",
+            f"**Analysis Date**: {analysis_date or time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}\n",
+            f"**Analysis Time**: {analysis_time:.2f} seconds\n",
+            f"**Total Technologies**: {len(result.technologies)}\n",
+            f"**Categories Detected**: {categories_detected}\n",
+            f"**WhatWeb Available**: {'Yes' if detector.whatweb.available else 'No'}\n\n",
+            "## Technology Categories\n\n",
+        ]
+        
+        # most_common() orders by count like the previous sort, keeping first-seen order for ties
+        lines.extend(f"- **{cat}**: {count} technologies\n" for cat, count in categories.most_common())
+        
+        lines.append("\n## Top Technologies by Confidence\n\n")
+        # Only the top 20 are listed, so select them without sorting everything
+        top_techs = nlargest(20, result.technologies, key=attrgetter('confidence'))
+        lines.extend(f"{i:2d}. **{tech.name}** ({tech.category}) - {tech.confidence}% confidence\n"
+                     for i, tech in enumerate(top_techs, 1))
+        
+        if len(technologies) > 20:
+            lines.append(f"\n... and {len(technologies) - 20} more technologies\n")
+        
+        # Write both files on worker threads at once, leaving the event loop to the other domains
+        await asyncio.gather(
+            asyncio.to_thread(_write_bytes, json_path, json_payload),
+            asyncio.to_thread(_write_text, summary_path, ''.join(lines))
+        )
         
         print(f" Analysis completed for {domain}")
         print(f"   Technologies: {len(result.technologies)}")
-        print(f"   Categories: {len(set(tech.category for tech in result.technologies))}")
+        print(f"   Categories: {categories_detected}")
         print(f"   Time: {analysis_time:.2f}s")
         print(f"   Files: {json_filename}, {summary_filename}")
         
         return {
             'domain': domain,
             'technologies': len(result.technologies),
-            'categories': len(set(tech.category for tech in result.technologies)),
+            'categories': categories_detected,
             'time': analysis_time,
             'success': True
         }
@@ -139,6 +193,8 @@ async def analyze_domain(domain: str, output_dir: str):
 
 async def main():
     """Run comprehensive analysis on all domains"""
+    configure_logging()
+    
     domains = [
         'dskbank.bg',
         'santamonica.gov', 
@@ -157,21 +213,50 @@ async def main():
     print(f"📁 Output directory: {output_base}")
     print(f"🌐 Domains to analyze: {len(domains)}")
     
-    results = []
     total_start = time.time()
+    # One timestamp dates the whole run: every domain report and the overall summary
+    analysis_date = time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime(total_start))
+    
+    # Initialize detector once; loading the datasets and pattern database dominates its cost.
+    # Its connection pool is shared by every domain, keeping DNS results and keep-alive connections.
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+    detector = UltimateTechDetector('data/datasets', connector=connector)
+    
+    # Domains are network-bound, so analyze them concurrently; the semaphore caps simultaneous analyses
+    semaphore = asyncio.Semaphore(4)
     
-    for domain in domains:
+    async def analyze_bounded(domain: str):
         domain_dir = os.path.join(output_base, domain.replace('.', '_'))
         os.makedirs(domain_dir, exist_ok=True)
-        
-        result = await analyze_domain(domain, domain_dir)
-        results.append(result)
+        async with semaphore:
+            return await analyze_domain(detector, domain, domain_dir, analysis_date)
+    
+    try:
+        outcomes = await asyncio.gather(*(analyze_bounded(domain) for domain in domains), return_exceptions=True)
+    finally:
+        await detector.close()
+        await connector.close()
+    
+    # gather keeps input order; anything analyze_domain did not catch becomes a failed result
+    results = []
+    for domain, outcome in zip(domains, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"❌ Analysis failed for {domain}: {outcome}")
+            outcome = {
+                'domain': domain,
+                'technologies': 0,
+                'categories': 0,
+                'time': time.time() - total_start,
+                'success': False,
+                'error': str(outcome)
+            }
+        results.append(outcome)
     
     total_time = time.time() - total_start
     
     # Create overall summary
     summary_data = {
-        'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+        'analysis_date': analysis_date,
         'total_domains': len(domains),
         'successful_analyses': len([r for r in results if r['success']]),
         'failed_analyses': len([r for r in results if not r['success']]),
@@ -184,8 +269,7 @@ async def main():
     
     # Save overall summary
     summary_path = os.path.join(output_base, 'analysis_summary.json')
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump(summary_data, f, indent=2, ensure_ascii=False, default=str)
+    _write_bytes(summary_path, _dumps(summary_data))
     
     # Print final summary
     print(f"\n🎉 Comprehensive Analysis Complete!")
@@ -4,41 +4,34 @@ Simple launcher for Ultimate Tech Detection System
 Usage: python detect.py https://example.com
 """
 
-import sys
+import argparse
 import asyncio
+from heapq import nlargest
+from operator import attrgetter
 from ultimate_tech_detector import UltimateTechDetector
+from logging_config import configure_logging
 
 async def main():
-    if len(sys.argv) < 2:
-        print("Usage: python detect.py <URL> [options]")
-        print("Example: python detect.py https://example.com --verbose --max-results 500")
-        sys.exit(1)
+    configure_logging()
     
-    url = sys.argv[1]
-    options = {}
+    parser = argparse.ArgumentParser(
+        description='Ultimate Tech Detection System',
+        epilog='Example: python detect.py https://example.com --verbose --max-results 500'
+    )
+    parser.add_argument('url', help='URL to analyze')
+    parser.add_argument('--verbose', action='store_true', help='Verbose analysis output')
+    parser.add_argument('--max-results', type=int, default=200, help='Maximum number of technologies to report')
+    parser.add_argument('--min-confidence', type=int, default=0, help='Minimum confidence to report')
+    args = parser.parse_args()
     
-    # Parse simple options
-    if '--verbose' in sys.argv:
+    url = args.url
+    options = {
+        'max_results': args.max_results,
+        'min_confidence': args.min_confidence
+    }
+    if args.verbose:
         options['verbose'] = True
     
-    if '--max-results' in sys.argv:
-        try:
-            idx = sys.argv.index('--max-results')
-            options['max_results'] = int(sys.argv[idx + 1])
-        except (ValueError, IndexError):
-            options['max_results'] = 200
-    else:
-        options['max_results'] = 200
-    
-    if '--min-confidence' in sys.argv:
-        try:
-            idx = sys.argv.index('--min-confidence')
-            options['min_confidence'] = int(sys.argv[idx + 1])
-        except (ValueError, IndexError):
-            options['min_confidence'] = 0
-    else:
-        options['min_confidence'] = 0
-    
     # Initialize detector
     detector = UltimateTechDetector()
     
@@ -63,9 +56,9 @@ async def main():
         print(f"  {level}: {count} technologies")
     
     print(f"\n Top Technologies:")
-    # Sort by confidence and show top 10
-    sorted_techs = sorted(result.technologies, key=lambda x: x.confidence, reverse=True)[:10]
-    for i, tech in enumerate(sorted_techs, 1):
+    # Show the top 10 by confidence without sorting everything
+    top_techs = nlargest(10, result.technologies, key=attrgetter('confidence'))
+    for i, tech in enumerate(top_techs, 1):
         print(f"  {i:2d}. {tech.name} ({tech.category}) - {tech.confidence}% confidence")
     
     if len(result.technologies) > 10:
@@ -3,13 +3,72 @@
 Comprehensive Logging Configuration for Tech Detection System
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+# Write buffer for log files; buffered records reach disk on ERROR, when full, every flush interval and at exit
+_FILE_BUFFER_SIZE = 64 * 1024
+_FLUSH_INTERVAL = 30.0
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that buffers writes and tracks the file size itself"""
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=_FILE_BUFFER_SIZE, encoding=self.encoding, errors=self.errors)
+        self._size = stream.tell()
+        self._rotatable = os.path.isfile(self.baseFilename)
+        return stream
+        
+    def emit(self, record):
+        """Format the record once and rotate on the tracked size instead of seeking the stream"""
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg) if msg.isascii() else len(msg.encode(self.encoding or 'utf-8', self.errors or 'strict'))
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._rotatable and self._size and self._size + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+class _RoutingQueueHandler(logging.handlers.QueueHandler):
+    """Queue records together with the file handlers they are meant for"""
+    
+    def __init__(self, log_queue, targets):
+        super().__init__(log_queue)
+        self.targets = targets
+        
+    def prepare(self, record):
+        record = super().prepare(record)
+        # The stack is already part of the prepared message
+        record.stack_info = None
+        record.log_targets = self.targets
+        return record
+
+class _RoutingQueueListener(logging.handlers.QueueListener):
+    """Single background thread that writes every queued record to its own file handlers"""
+    
+    def handle(self, record):
+        for handler in record.log_targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
 class TechDetectionLogger:
     """Centralized logging configuration for the Tech Detection system"""
     
@@ -28,6 +87,11 @@ class TechDetectionLogger:
         # Create log file with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = self.log_dir / f"tech_detection_{timestamp}.log"
+        self._file_handlers = []
+        
+        # File handlers run on one listener thread; loggers only enqueue records
+        self._queue = queue.SimpleQueue()
+        self._listener = _RoutingQueueListener(self._queue)
         
         # Configure root logger
         self.setup_root_logger()
@@ -43,6 +107,10 @@ class TechDetectionLogger:
         # Create summary log
         self.setup_summary_logger()
         
+        self._listener.start()
+        atexit.register(self._listener.stop)
+        self._schedule_flush()
+        
     def setup_root_logger(self):
         """Setup root logger with file and console handlers"""
         root_logger = logging.getLogger()
@@ -52,11 +120,12 @@ class TechDetectionLogger:
         root_logger.handlers.clear()
         
         # File handler with rotation
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             self.log_file,
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         file_handler.setLevel(logging.DEBUG)
         
@@ -78,7 +147,7 @@ class TechDetectionLogger:
         file_handler.setFormatter(detailed_formatter)
         console_handler.setFormatter(console_formatter)
         
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(self._register(file_handler))
         root_logger.addHandler(console_handler)
         
     def setup_api_logger(self):
@@ -87,11 +156,12 @@ class TechDetectionLogger:
         api_logger.setLevel(logging.DEBUG)
         
         # API specific log file
-        api_file_handler = logging.handlers.RotatingFileHandler(
+        api_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "api_server.log",
             maxBytes=5*1024*1024,  # 5MB
             backupCount=3,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         api_file_handler.setLevel(logging.DEBUG)
         
@@ -100,7 +170,7 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         api_file_handler.setFormatter(api_formatter)
-        api_logger.addHandler(api_file_handler)
+        api_logger.addHandler(self._register(api_file_handler))
         
     def setup_detector_logger(self):
         """Setup detector specific logger"""
@@ -108,11 +178,12 @@ class TechDetectionLogger:
         detector_logger.setLevel(logging.DEBUG)
         
         # Detector specific log file
-        detector_file_handler = logging.handlers.RotatingFileHandler(
+        detector_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "detector.log",
             maxBytes=10*1024*1024,  # 10MB
             backupCount=3,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         detector_file_handler.setLevel(logging.DEBUG)
         
@@ -121,18 +192,19 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         detector_file_handler.setFormatter(detector_formatter)
-        detector_logger.addHandler(detector_file_handler)
+        detector_logger.addHandler(self._register(detector_file_handler))
         
     def setup_whatweb_logger(self):
         """Setup WhatWeb specific logger"""
         whatweb_logger = logging.getLogger('whatweb')
         whatweb_logger.setLevel(logging.DEBUG)
         
-        whatweb_file_handler = logging.handlers.RotatingFileHandler(
+        whatweb_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "whatweb.log",
             maxBytes=5*1024*1024,  # 5MB
             backupCount=2,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         whatweb_file_handler.setLevel(logging.DEBUG)
         
@@ -141,18 +213,19 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         whatweb_file_handler.setFormatter(whatweb_formatter)
-        whatweb_logger.addHandler(whatweb_file_handler)
+        whatweb_logger.addHandler(self._register(whatweb_file_handler))
         
     def setup_cmseek_logger(self):
         """Setup CMSeeK specific logger"""
         cmseek_logger = logging.getLogger('cmseek')
         cmseek_logger.setLevel(logging.DEBUG)
         
-        cmseek_file_handler = logging.handlers.RotatingFileHandler(
+        cmseek_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "cmseek.log",
             maxBytes=5*1024*1024,  # 5MB
             backupCount=2,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         cmseek_file_handler.setLevel(logging.DEBUG)
         
@@ -161,18 +234,19 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         cmseek_file_handler.setFormatter(cmseek_formatter)
-        cmseek_logger.addHandler(cmseek_file_handler)
+        cmseek_logger.addHandler(self._register(cmseek_file_handler))
         
     def setup_whatcms_logger(self):
         """Setup WhatCMS specific logger"""
         whatcms_logger = logging.getLogger('whatcms')
         whatcms_logger.setLevel(logging.DEBUG)
         
-        whatcms_file_handler = logging.handlers.RotatingFileHandler(
+        whatcms_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "whatcms.log",
             maxBytes=5*1024*1024,  # 5MB
             backupCount=2,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         whatcms_file_handler.setLevel(logging.DEBUG)
         
@@ -181,18 +255,19 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         whatcms_file_handler.setFormatter(whatcms_formatter)
-        whatcms_logger.addHandler(whatcms_file_handler)
+        whatcms_logger.addHandler(self._register(whatcms_file_handler))
         
     def setup_wappalyzer_logger(self):
         """Setup Wappalyzer specific logger"""
         wappalyzer_logger = logging.getLogger('wappalyzer')
         wappalyzer_logger.setLevel(logging.DEBUG)
         
-        wappalyzer_file_handler = logging.handlers.RotatingFileHandler(
+        wappalyzer_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "wappalyzer.log",
             maxBytes=5*1024*1024,  # 5MB
             backupCount=2,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         wappalyzer_file_handler.setLevel(logging.DEBUG)
         
@@ -201,18 +276,19 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         wappalyzer_file_handler.setFormatter(wappalyzer_formatter)
-        wappalyzer_logger.addHandler(wappalyzer_file_handler)
+        wappalyzer_logger.addHandler(self._register(wappalyzer_file_handler))
         
     def setup_summary_logger(self):
         """Setup summary logger for high-level events"""
         summary_logger = logging.getLogger('summary')
         summary_logger.setLevel(logging.INFO)
         
-        summary_file_handler = logging.handlers.RotatingFileHandler(
+        summary_file_handler = BufferedRotatingFileHandler(
             self.log_dir / "summary.log",
             maxBytes=2*1024*1024,  # 2MB
             backupCount=10,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         summary_file_handler.setLevel(logging.INFO)
         
@@ -221,7 +297,29 @@ class TechDetectionLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         summary_file_handler.setFormatter(summary_formatter)
-        summary_logger.addHandler(summary_file_handler)
+        summary_logger.addHandler(self._register(summary_file_handler))
+        
+    def _register(self, handler):
+        """Hand a file handler to the listener thread and return the queue handler to attach instead"""
+        self._file_handlers.append(handler)
+        queue_handler = _RoutingQueueHandler(self._queue, (handler,))
+        queue_handler.setLevel(handler.level)
+        return queue_handler
+        
+    def _schedule_flush(self):
+        """Flush the file handlers every _FLUSH_INTERVAL seconds"""
+        timer = threading.Timer(_FLUSH_INTERVAL, self._flush_periodically)
+        timer.daemon = True
+        timer.start()
+        
+    def _flush_periodically(self):
+        self.flush()
+        self._schedule_flush()
+        
+    def flush(self):
+        """Write buffered records of every file handler to disk"""
+        for handler in self._file_handlers:
+            handler.flush()
         
     def get_logger(self, name):
         """Get a logger instance"""
@@ -229,27 +327,22 @@ class TechDetectionLogger:
         
     def log_analysis_start(self, url, engines):
         """Log the start of an analysis"""
-        summary_logger = self.get_logger('summary')
-        summary_logger.info(f"ANALYSIS_START: {url} with engines: {engines}")
+        log_analysis_start(url, engines)
         
     def log_analysis_complete(self, url, technologies_count, analysis_time, engines_used):
         """Log the completion of an analysis"""
-        summary_logger = self.get_logger('summary')
-        summary_logger.info(f"ANALYSIS_COMPLETE: {url} - {technologies_count} technologies in {analysis_time:.2f}s using {engines_used}")
+        log_analysis_complete(url, technologies_count, analysis_time, engines_used)
         
     def log_analysis_error(self, url, error_message):
         """Log an analysis error"""
-        summary_logger = self.get_logger('summary')
-        summary_logger.error(f"ANALYSIS_ERROR: {url} - {error_message}")
+        log_analysis_error(url, error_message)
         
     def log_engine_status(self, engine_name, status, details=""):
         """Log engine status"""
-        summary_logger = self.get_logger('summary')
-        summary_logger.info(f"ENGINE_STATUS: {engine_name} - {status} {details}")
+        log_engine_status(engine_name, status, details)
         
     def cleanup_old_logs(self, days_to_keep=7):
         """Clean up old log files"""
-        import time
         current_time = time.time()
         cutoff_time = current_time - (days_to_keep * 24 * 60 * 60)
         
@@ -261,31 +354,42 @@ class TechDetectionLogger:
                 except Exception as e:
                     print(f"Failed to clean up {log_file}: {e}")
 
-# Global logger instance
-logger_config = TechDetectionLogger()
+# Global logger instance, created by configure_logging() so importing this module opens no files
+logger_config = None
+
+def configure_logging(log_dir="logs"):
+    """Install the file and console handlers once; safe to call repeatedly"""
+    global logger_config
+    if logger_config is None:
+        logger_config = TechDetectionLogger(log_dir)
+    return logger_config
 
 def get_logger(name):
     """Get a logger instance"""
-    return logger_config.get_logger(name)
+    return logging.getLogger(name)
+
+# Summary events are formatted lazily, only once a handler accepts them
+_summary_logger = logging.getLogger('summary')
 
 def log_analysis_start(url, engines):
     """Log the start of an analysis"""
-    logger_config.log_analysis_start(url, engines)
+    _summary_logger.info("ANALYSIS_START: %s with engines: %s", url, engines)
 
 def log_analysis_complete(url, technologies_count, analysis_time, engines_used):
     """Log the completion of an analysis"""
-    logger_config.log_analysis_complete(url, technologies_count, analysis_time, engines_used)
+    _summary_logger.info("ANALYSIS_COMPLETE: %s - %s technologies in %.2fs using %s", url, technologies_count, analysis_time, engines_used)
 
 def log_analysis_error(url, error_message):
     """Log an analysis error"""
-    logger_config.log_analysis_error(url, error_message)
+    _summary_logger.error("ANALYSIS_ERROR: %s - %s", url, error_message)
 
 def log_engine_status(engine_name, status, details=""):
     """Log engine status"""
-    logger_config.log_engine_status(engine_name, status, details)
+    _summary_logger.info("ENGINE_STATUS: %s - %s %s", engine_name, status, details)
 
 if __name__ == "__main__":
     # Test the logging configuration
+    configure_logging()
     logger = get_logger('test')
     logger.info("Logging configuration test successful")
     logger.debug("Debug message test")
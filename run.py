@@ -21,6 +21,8 @@ def run_server():
     
     # Import and run the server
     try:
+        from logging_config import configure_logging
+        configure_logging()
         from api_server import app
         print(" Server starting on http://localhost:9000")
         print("📱 Dashboard: http://localhost:9000")
@@ -5,8 +5,11 @@ Removes unnecessary files, temporary data, and optimizes project structure
 """
 
 import os
+import re
 import shutil
 import glob
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 
@@ -14,6 +17,74 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# unlinkat() against an open directory resolves each directory once instead of once per file
+_UNLINK_DIR_FD = os.unlink in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+
+# Deletions are I/O bound, so overlap them on more threads than there are cores
+_MAX_DELETE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Temporary and backup files removed by clean_temporary_files, matched by suffix or exact name
+_TEMP_SUFFIXES = (".tmp", ".temp", ".bak", ".backup", ".old", ".orig", ".rej", ".swp", ".swo", "~")
+_TEMP_NAMES = frozenset({".DS_Store", "Thumbs.db"})
+
+# Timestamp suffix on report names, like _20251002_050641
+_TS_RE = re.compile(r'_\d{8}_\d{6}$')
+
+class _ScanResult:
+    """Cleanup candidates collected by a single walk of the project tree"""
+    
+    def __init__(self):
+        self.pycache_dirs = []
+        self.pyc_files = []
+        self.temp_files = []
+        self.report_files = []
+        self.log_files = []
+        self.output_entries = []
+
+def _unlink_directory_files(directory, files):
+    """Unlink files that share a parent directory and return the ones removed
+    
+    The candidates come from a scan taken before earlier cleanup steps ran, so
+    files (or whole directories) that have already gone are skipped. Any other
+    failure is logged and the rest of the batch still runs.
+    """
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY) if _UNLINK_DIR_FD else None
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        logger.warning(f"Failed to open {directory}: {e}")
+        return []
+    removed = []
+    try:
+        for path in files:
+            try:
+                if dir_fd is None:
+                    os.unlink(path)
+                else:
+                    os.unlink(path.name, dir_fd=dir_fd)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to remove {path}: {e}")
+                continue
+            removed.append(path)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return removed
+
+def _remove_tree(path):
+    """Remove a directory tree, returning whether it is gone"""
+    try:
+        shutil.rmtree(path)
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.warning(f"Failed to remove {path}: {e}")
+        return False
+    return True
+
 class ProjectCleanup:
     """Comprehensive project cleanup and optimization"""
     
@@ -22,59 +93,39 @@ class ProjectCleanup:
         self.cleaned_files = []
         self.cleaned_dirs = []
         
-    def clean_python_cache(self):
+    def clean_python_cache(self, scan=None):
         """Remove Python cache files and __pycache__ directories"""
         logger.info("Cleaning Python cache files...")
+        if scan is None:
+            scan = self._scan()
         
-        # Remove __pycache__ directories
-        for pycache_dir in self.project_root.rglob("__pycache__"):
-            if pycache_dir.is_dir():
-                shutil.rmtree(pycache_dir)
-                self.cleaned_dirs.append(str(pycache_dir))
-                logger.info(f"Removed {pycache_dir}")
+        # Remove __pycache__ directories; the scan never nests them, so they can go in parallel
+        removed = self._run_parallel(_remove_tree, scan.pycache_dirs)
+        for pycache_dir, was_removed in zip(scan.pycache_dirs, removed):
+            if not was_removed:
+                continue
+            self.cleaned_dirs.append(str(pycache_dir))
+            logger.info(f"Removed {pycache_dir}")
         
         # Remove .pyc files
-        for pyc_file in self.project_root.rglob("*.pyc"):
-            if pyc_file.is_file():
-                pyc_file.unlink()
-                self.cleaned_files.append(str(pyc_file))
-                logger.info(f"Removed {pyc_file}")
+        self._unlink_files(scan.pyc_files)
         
         logger.info(f"Cleaned {len(self.cleaned_files)} .pyc files and {len(self.cleaned_dirs)} __pycache__ directories")
     
-    def clean_temporary_files(self):
+    def clean_temporary_files(self, scan=None):
         """Remove temporary and backup files"""
         logger.info("Cleaning temporary files...")
+        if scan is None:
+            scan = self._scan()
         
-        # File patterns to remove
-        temp_patterns = [
-            "*.tmp",
-            "*.temp", 
-            "*.bak",
-            "*.backup",
-            "*.old",
-            "*.orig",
-            "*.rej",
-            "*.swp",
-            "*.swo",
-            "*~",
-            ".DS_Store",
-            "Thumbs.db"
-        ]
-        
-        for pattern in temp_patterns:
-            for file_path in self.project_root.rglob(pattern):
-                if file_path.is_file():
-                    file_path.unlink()
-                    self.cleaned_files.append(str(file_path))
-                    logger.info(f"Removed {file_path}")
+        self._unlink_files(scan.temp_files)
     
-    def clean_old_reports(self):
+    def clean_old_reports(self, scan=None):
         """Clean up old CSV report files"""
         logger.info("Cleaning old report files...")
         
         # Keep only the most recent reports, remove old ones
-        csv_files = list(self.project_root.glob("*.csv"))
+        csv_files = scan.report_files if scan is not None else list(self.project_root.glob("*.csv"))
         
         # Group by base name (without timestamp)
         report_groups = {}
@@ -82,8 +133,7 @@ class ProjectCleanup:
             # Extract base name (remove timestamp pattern)
             base_name = csv_file.stem
             # Remove timestamp pattern like _20251002_050641
-            import re
-            base_name = re.sub(r'_\d{8}_\d{6}$', '', base_name)
+            base_name = _TS_RE.sub('', base_name)
             
             if base_name not in report_groups:
                 report_groups[base_name] = []
@@ -99,12 +149,12 @@ class ProjectCleanup:
                     self.cleaned_files.append(str(old_file))
                     logger.info(f"Removed old report: {old_file}")
     
-    def clean_log_files(self):
+    def clean_log_files(self, scan=None):
         """Clean up log files"""
         logger.info("Cleaning log files...")
         
         # Remove log files (keep recent ones)
-        log_files = list(self.project_root.glob("*.log"))
+        log_files = scan.log_files if scan is not None else list(self.project_root.glob("*.log"))
         
         if len(log_files) > 1:
             # Sort by modification time, keep the newest
@@ -159,27 +209,92 @@ class ProjectCleanup:
                 except OSError:
                     pass  # Directory not empty or permission error
     
-    def clean_output_directory(self):
+    def clean_output_directory(self, scan=None):
         """Clean up output directory but keep structure"""
         logger.info("Cleaning output directory...")
         
         output_dir = self.project_root / "output"
         if output_dir.exists():
-            # Remove all files but keep directory structure
-            for item in output_dir.rglob("*"):
-                if item.is_file():
-                    item.unlink()
-                    self.cleaned_files.append(str(item))
-                    logger.info(f"Removed output file: {item}")
-                elif item.is_dir() and item != output_dir:
-                    # Remove empty subdirectories
+            if scan is None:
+                scan = self._scan()
+            
+            # Remove all files but keep directory structure; directories are
+            # checked before any file is removed so only already-empty ones go
+            output_files = []
+            for item, is_dir in scan.output_entries:
+                if is_dir:
                     try:
-                        if not any(item.iterdir()):
-                            item.rmdir()
-                            self.cleaned_dirs.append(str(item))
-                            logger.info(f"Removed empty output directory: {item}")
+                        item.rmdir()
+                        self.cleaned_dirs.append(str(item))
+                        logger.info(f"Removed empty output directory: {item}")
                     except OSError:
-                        pass
+                        pass  # Directory not empty or permission error
+                else:
+                    output_files.append(item)
+            self._unlink_files(output_files, "Removed output file:")
+    
+    def _scan(self):
+        """Walk the project tree once and sort every cleanup candidate into its category"""
+        scan = _ScanResult()
+        self._scan_directory(str(self.project_root), scan, top_level=True, in_output=False)
+        return scan
+    
+    def _scan_directory(self, directory, scan, top_level, in_output):
+        """Classify the entries of one directory, then descend into its real subdirectories"""
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            is_dir = entry.is_dir()
+            if is_dir and name == "__pycache__":
+                # Removed as a whole, so nothing inside needs classifying
+                scan.pycache_dirs.append(Path(entry.path))
+                continue
+            if is_dir and not entry.is_symlink():
+                subdirs.append(entry)
+            
+            if name.endswith(".pyc") and entry.is_file():
+                scan.pyc_files.append(Path(entry.path))
+            elif (name.endswith(_TEMP_SUFFIXES) or name in _TEMP_NAMES) and entry.is_file():
+                scan.temp_files.append(Path(entry.path))
+            elif in_output:
+                if is_dir:
+                    scan.output_entries.append((Path(entry.path), True))
+                elif entry.is_file():
+                    scan.output_entries.append((Path(entry.path), False))
+            elif top_level:
+                if name.endswith(".csv"):
+                    scan.report_files.append(Path(entry.path))
+                elif name.endswith(".log"):
+                    scan.log_files.append(Path(entry.path))
+        
+        for entry in subdirs:
+            self._scan_directory(entry.path, scan, top_level=False,
+                                 in_output=in_output or (top_level and entry.name == "output"))
+    
+    def _unlink_files(self, paths, label="Removed"):
+        """Unlink a batch of files, one directory per worker so each directory is opened once"""
+        by_directory = defaultdict(list)
+        for path in paths:
+            by_directory[path.parent].append(path)
+        
+        for files in self._run_parallel(_unlink_directory_files, by_directory.keys(), by_directory.values()):
+            for path in files:
+                self.cleaned_files.append(str(path))
+                logger.info(f"{label} {path}")
+    
+    def _run_parallel(self, func, *iterables):
+        """Map func over the arguments on a thread pool, keeping results in order"""
+        args = list(zip(*iterables))
+        if len(args) < 2:
+            return [func(*arg) for arg in args]
+        with ThreadPoolExecutor(max_workers=min(len(args), _MAX_DELETE_WORKERS)) as executor:
+            return list(executor.map(func, *zip(*args)))
     
     def optimize_gitignore(self):
         """Update .gitignore to prevent future clutter"""
@@ -296,17 +411,20 @@ output/logs/*.log
         logger.info("Starting comprehensive project cleanup...")
         
         try:
+            # Walk the project tree once for every cleanup step
+            scan = self._scan()
+            
             # Clean Python cache
-            self.clean_python_cache()
+            self.clean_python_cache(scan)
             
             # Clean temporary files
-            self.clean_temporary_files()
+            self.clean_temporary_files(scan)
             
             # Clean old reports
-            self.clean_old_reports()
+            self.clean_old_reports(scan)
             
             # Clean log files
-            self.clean_log_files()
+            self.clean_log_files(scan)
             
             # Clean duplicate datasets
             self.clean_duplicate_datasets()
@@ -315,7 +433,7 @@ output/logs/*.log
             self.clean_empty_directories()
             
             # Clean output directory
-            self.clean_output_directory()
+            self.clean_output_directory(scan)
             
             # Optimize gitignore
             self.optimize_gitignore()
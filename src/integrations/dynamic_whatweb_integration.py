@@ -8,14 +8,120 @@ import subprocess
 import json
 import time
 import logging
+import math
+import os
 import re
-from typing import Dict, List, Any, Optional, Tuple
+import queue
+import signal
+import tempfile
+import threading
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Shared session so complexity probes reuse keep-alive connections, sized for concurrent prewarming
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+
+# WhatWeb's default --max-threads: a batch scans at most this many targets at once
+_WHATWEB_MAX_THREADS = 25
+
+# Known complex domains; subdomains match too
+_COMPLEX_DOMAINS = frozenset({
+    'github.com', 'stackoverflow.com', 'google.com', 'facebook.com',
+    'amazon.com', 'microsoft.com', 'apple.com', 'netflix.com',
+    'youtube.com', 'twitter.com', 'linkedin.com', 'instagram.com'
+})
+_COMPLEX_DOMAIN_SUFFIXES = tuple(f".{domain}" for domain in _COMPLEX_DOMAINS)
+
+# Response headers that hint at site complexity (lowercase)
+_CDN_HEADERS = frozenset({'cf-ray', 'x-served-by', 'x-cache'})
+_SECURITY_HEADERS = frozenset({'x-frame-options', 'content-security-policy', 'strict-transport-security'})
+_FRAMEWORK_HEADERS = frozenset({'x-powered-by', 'server'})
+_BOT_PROTECTION_HEADERS = frozenset({'cf-bgj', 'cf-ray', 'x-bot-protection'})
+
+# ANSI color codes; only seen if a WhatWeb build ignores --color=never
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Version patterns, tried in order: a three-part version anywhere wins over a two-part one
+_VERSION_RES = (
+    re.compile(r'(\d+\.\d+\.\d+)'),
+    re.compile(r'(\d+\.\d+)'),
+)
+
+
+@lru_cache(maxsize=None)
+def _detection_result_cls():
+    """Import DetectionResult once, on first use, to keep module import free of src.core"""
+    from ..core.enhanced_tech_detector import DetectionResult
+    return DetectionResult
+
+
+def _kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session=True together with its children"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups on this platform, or the group is already gone
+        process.kill()
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _iter_json_objects(text: str) -> Iterator[Dict[str, Any]]:
+    """Yield the top-level JSON objects embedded in text, in order
+    
+    Objects wrapped in an array are yielded one by one; a decode is only attempted at '{'.
+    """
+    index = text.find('{')
+    while index != -1:
+        try:
+            data, end = _JSON_DECODER.raw_decode(text, index)
+        except json.JSONDecodeError:
+            index = text.find('{', index + 1)
+            continue
+        if isinstance(data, dict):
+            yield data
+        index = text.find('{', end)
+
+
+# A dict holding any of these keys looks like a WhatWeb record
+_WHATWEB_RECORD_KEYS = frozenset({'plugins', 'http_status', 'plugins_count', 'target'})
+
+# Evidence templates for plugin fields; 'match' and 'version' are filled per plugin
+_STRING_EVIDENCE = {'field': 'whatweb', 'detail': 'plugin_string', 'match': None, 'confidence': 60, 'version': None}
+_VERSION_EVIDENCE = {'field': 'whatweb', 'detail': 'plugin_version', 'match': None, 'confidence': 70, 'version': None}
+
+
+@lru_cache(maxsize=64)
+def _option_flags(aggression: Optional[int], user_agent: Optional[str], verbose: bool) -> Tuple[str, ...]:
+    """WhatWeb arguments for one option preset; a batch scan reuses a handful of presets"""
+    # JSON only on stdout: no brief log lines and no color codes
+    flags = ["--log-json=-", "--quiet", "--color=never"]
+    if aggression is not None:
+        flags.extend(["-a", str(aggression)])
+    if user_agent:
+        flags.extend(["-U", user_agent])
+    if verbose:
+        flags.append("--verbose")
+    return tuple(flags)
+
+
+def _normalize_target(url: str) -> str:
+    """Normalize a URL the way WhatWeb reports it as a target"""
+    if '://' not in url:
+        url = f"http://{url}"
+    return url.rstrip('/')
+
 class DynamicWhatWebIntegration:
     """WhatWeb integration with dynamic timeout based on site complexity"""
     
@@ -28,22 +134,39 @@ class DynamicWhatWebIntegration:
             'complex': 4.0,     # Enterprise sites, heavy frameworks
             'protected': 6.0    # Sites with anti-bot protection
         }
+        self.max_probe_workers = 10
+        self.complexity_cache_size = 1024
+        self.complexity_ttl = 600  # seconds
+        self._complexity_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._complexity_lock = threading.Lock()
+        self._worker_command: Optional[List[str]] = None
+        self._workers: List[subprocess.Popen] = []
+        self._idle_workers: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self._workers_lock = threading.Lock()
         self._check_whatweb_availability()
     
     def _check_whatweb_availability(self) -> bool:
         """Check if WhatWeb is available and working"""
         try:
-            result = subprocess.run(
+            process = subprocess.Popen(
                 [self.whatweb_path, "--version"],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=5
+                start_new_session=True
             )
-            if result.returncode == 0:
-                logger.info(f"WhatWeb found: {result.stdout.strip()}")
+            try:
+                stdout, stderr = process.communicate(timeout=5)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(process)
+                process.communicate()
+                raise
+            
+            if process.returncode == 0:
+                logger.info(f"WhatWeb found: {stdout.strip()}")
                 return True
             else:
-                logger.error(f"WhatWeb not available: {result.stderr}")
+                logger.error(f"WhatWeb not available: {stderr}")
                 return False
         except Exception as e:
             logger.error(f"WhatWeb check failed: {e}")
@@ -54,43 +177,31 @@ class DynamicWhatWebIntegration:
         try:
             # Parse URL
             parsed = urlparse(url)
-            domain = parsed.netloc.lower()
+            hostname = parsed.hostname or ''
             
             # Check for known complex domains
-            complex_domains = [
-                'github.com', 'stackoverflow.com', 'google.com', 'facebook.com',
-                'amazon.com', 'microsoft.com', 'apple.com', 'netflix.com',
-                'youtube.com', 'twitter.com', 'linkedin.com', 'instagram.com'
-            ]
-            
-            if any(complex_domain in domain for complex_domain in complex_domains):
+            if hostname in _COMPLEX_DOMAINS or hostname.endswith(_COMPLEX_DOMAIN_SUFFIXES):
                 return 'protected'
             
             # Quick site analysis
             try:
-                response = requests.get(url, timeout=10, allow_redirects=True)
-                content_length = len(response.content)
+                response = _SESSION.head(url, timeout=5, allow_redirects=True)
                 response_time = response.elapsed.total_seconds()
                 
                 # Analyze headers for complexity indicators
                 headers = response.headers
-                complexity_indicators = 0
-                
-                # Check for CDN/proxy indicators
-                if any(header in headers for header in ['cf-ray', 'x-served-by', 'x-cache']):
-                    complexity_indicators += 1
-                
-                # Check for security headers
-                if any(header in headers for header in ['x-frame-options', 'content-security-policy', 'strict-transport-security']):
-                    complexity_indicators += 1
+                content_length = int(headers.get('content-length') or 0)
+                if not content_length:
+                    content_length = self._sample_content_length(url)
+                header_names = {name.lower() for name in headers}
                 
-                # Check for framework indicators
-                if any(header in headers for header in ['x-powered-by', 'server']):
-                    complexity_indicators += 1
-                
-                # Check for anti-bot protection
-                if any(header in headers for header in ['cf-bgj', 'cf-ray', 'x-bot-protection']):
-                    complexity_indicators += 2
+                # CDN/proxy, security and framework headers count once each; anti-bot protection counts twice
+                complexity_indicators = (
+                    bool(header_names & _CDN_HEADERS)
+                    + bool(header_names & _SECURITY_HEADERS)
+                    + bool(header_names & _FRAMEWORK_HEADERS)
+                    + 2 * bool(header_names & _BOT_PROTECTION_HEADERS)
+                )
                 
                 # Determine complexity based on indicators
                 if complexity_indicators >= 3 or content_length > 1000000 or response_time > 2:
@@ -108,12 +219,59 @@ class DynamicWhatWebIntegration:
             logger.warning(f"Site complexity analysis failed: {e}")
             return 'medium'
     
+    def _sample_content_length(self, url: str) -> int:
+        """Content-Length declared by a streamed GET, 0 if it has none; the body is never read"""
+        with _SESSION.get(url, stream=True, timeout=5, allow_redirects=True) as response:
+            return int(response.headers.get('content-length') or 0)
+    
+    def prewarm_complexity(self, urls: List[str]) -> None:
+        """Probe the complexity of several sites concurrently and cache it per domain"""
+        pending = {}
+        for url in urls:
+            domain = urlparse(url).netloc.lower()
+            if domain not in pending and self._get_cached_complexity(domain) is None:
+                pending[domain] = url
+        if not pending:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_probe_workers, len(pending))) as executor:
+            labels = executor.map(self.analyze_site_complexity, pending.values())
+            for domain, complexity in zip(pending, labels):
+                self._store_complexity(domain, complexity)
+    
+    def _get_cached_complexity(self, domain: str) -> Optional[str]:
+        """Return the cached complexity for a domain if it has not expired"""
+        with self._complexity_lock:
+            cached = self._complexity_cache.get(domain)
+            if cached is None:
+                return None
+            
+            complexity, stored_at = cached
+            if time.monotonic() - stored_at > self.complexity_ttl:
+                self._complexity_cache.pop(domain, None)
+                return None
+            
+            self._complexity_cache.move_to_end(domain)
+            return complexity
+    
+    def _store_complexity(self, domain: str, complexity: str) -> None:
+        """Cache a domain's complexity, evicting the least recently used entries"""
+        with self._complexity_lock:
+            self._complexity_cache[domain] = (complexity, time.monotonic())
+            self._complexity_cache.move_to_end(domain)
+            while len(self._complexity_cache) > self.complexity_cache_size:
+                self._complexity_cache.popitem(last=False)
+    
     def calculate_dynamic_timeout(self, url: str, base_timeout: int = None) -> int:
         """Calculate dynamic timeout based on site complexity"""
         if base_timeout is None:
             base_timeout = self.base_timeout
         
-        complexity = self.analyze_site_complexity(url)
+        domain = urlparse(url).netloc.lower()
+        complexity = self._get_cached_complexity(domain)
+        if complexity is None:
+            complexity = self.analyze_site_complexity(url)
+            self._store_complexity(domain, complexity)
         multiplier = self.timeout_multipliers.get(complexity, 2.0)
         
         dynamic_timeout = int(base_timeout * multiplier)
@@ -123,73 +281,221 @@ class DynamicWhatWebIntegration:
     
     def build_command(self, url: str, options: Dict[str, Any]) -> List[str]:
         """Build WhatWeb command with dynamic options"""
-        cmd = [self.whatweb_path, url, "--log-json=-"]
-        
-        # Aggression level (limit to max 1 for dynamic timeout)
-        if 'aggression' in options:
-            aggression = min(int(options['aggression']), 1)  # Cap at 1 for reliability
-            cmd.extend(["-a", str(aggression)])
-        
-        # User agent
-        if 'user_agent' in options:
-            cmd.extend(["-U", options['user_agent']])
-        
-        # Verbose output
-        if options.get('verbose', False):
-            cmd.append("--verbose")
-        
-        return cmd
+        return self.build_batch_command([url], options)
+    
+    def build_batch_command(self, urls: List[str], options: Dict[str, Any]) -> List[str]:
+        """Build one WhatWeb command covering every URL in the batch"""
+        # Aggression level (capped at 1 for reliability with dynamic timeout)
+        aggression = min(int(options['aggression']), 1) if 'aggression' in options else None
+        flags = _option_flags(aggression, options.get('user_agent'), bool(options.get('verbose', False)))
+        return [self.whatweb_path, *urls, *flags]
     
     def analyze_url(self, url: str, options: Dict[str, Any] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """Analyze URL with dynamic timeout"""
         options = options or {}
+        if self._worker_command is not None and self.build_batch_command([], options) == self._worker_command:
+            outcome = self._analyze_with_worker(url, options)
+            if outcome is not None:
+                return outcome
+        return self.analyze_urls([url], options)[url]
+    
+    def analyze_urls(self, urls: List[str], options: Dict[str, Any] = None) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Analyze several URLs with a single WhatWeb run, keyed by URL"""
+        urls = list(dict.fromkeys(urls))
+        results = {url: (result, error) for url, result, error in self.iter_analyze_urls(urls, options)}
+        return {url: results[url] for url in urls}
+    
+    def iter_analyze_urls(self, urls: List[str], options: Dict[str, Any] = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Analyze several URLs with a single WhatWeb run, yielding (url, result, error) as each record arrives
+        
+        Records already yielded stand even if the run later times out or fails; the error covers the rest.
+        """
+        options = options or {}
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+        
+        pending: Dict[str, List[str]] = {}
+        for url in urls:
+            pending.setdefault(_normalize_target(url), []).append(url)
         
         try:
-            # Calculate dynamic timeout
-            dynamic_timeout = self.calculate_dynamic_timeout(url, options.get('timeout'))
+            # Probe all sites at once; the slowest site's timeout covers each round of concurrently scanned targets
+            self.prewarm_complexity(urls)
+            dynamic_timeout = max(self.calculate_dynamic_timeout(url, options.get('timeout')) for url in urls)
+            dynamic_timeout *= math.ceil(len(urls) / _WHATWEB_MAX_THREADS)
             
             # Build command
-            cmd = self.build_command(url, options)
+            cmd = self.build_batch_command(urls, options)
             logger.debug(f"Running WhatWeb command: {' '.join(cmd)} (timeout: {dynamic_timeout}s)")
             
-            # Execute WhatWeb with dynamic timeout
+            # Execute WhatWeb with dynamic timeout, handing out records while it scans the next target
             start_time = time.time()
-            try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=dynamic_timeout
-                )
-                execution_time = time.time() - start_time
-            except subprocess.TimeoutExpired:
+            timed_out = threading.Event()
+            unparsed = []
+            with tempfile.TemporaryFile(mode='w+') as stderr_file:
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True,
+                                           bufsize=1, start_new_session=True)
+                def _kill_stalled_process():
+                    timed_out.set()
+                    _kill_process_group(process)
+                timer = threading.Timer(dynamic_timeout, _kill_stalled_process)
+                timer.start()
+                try:
+                    for line in process.stdout:
+                        found = False
+                        for entry in self._iter_records(line):
+                            found = True
+                            matched = pending.pop(_normalize_target(str(entry['target'])), None)
+                            # A single target takes the first record, as the whole-output parse did
+                            if matched is None and len(urls) == 1 and pending:
+                                matched = pending.popitem()[1]
+                            if matched is None:
+                                continue
+                            entry['execution_time'] = time.time() - start_time
+                            for url in matched:
+                                yield url, entry, None
+                        if not found:
+                            unparsed.append(line)
+                    returncode = process.wait()
+                finally:
+                    timer.cancel()
+                    if process.poll() is None:
+                        _kill_process_group(process)
+                    process.stdout.close()
+                    process.wait()
                 execution_time = time.time() - start_time
-                error_msg = f"WhatWeb command timed out after {dynamic_timeout} seconds"
-                logger.warning(error_msg)
-                return None, error_msg
-            
-            if result.returncode != 0:
-                error_msg = f"WhatWeb execution failed (exit code {result.returncode}): {result.stderr}"
-                logger.error(error_msg)
-                return None, error_msg
+                
+                error_msg = None
+                if timed_out.is_set():
+                    error_msg = f"WhatWeb command timed out after {dynamic_timeout} seconds"
+                    logger.warning(error_msg)
+                elif returncode != 0:
+                    stderr_file.seek(0)
+                    error_msg = f"WhatWeb execution failed (exit code {returncode}): {stderr_file.read()}"
+                    logger.error(error_msg)
             
-            # Parse output
-            parsed_result = self._parse_output(result.stdout, execution_time)
-            if parsed_result is None:
-                return None, "Failed to parse WhatWeb output"
+            if error_msg is None and len(urls) == 1 and pending:
+                parsed_result = self._parse_output(''.join(unparsed), execution_time)
+                if parsed_result is not None:
+                    pending.clear()
+                    yield urls[0], parsed_result, None
             
-            return parsed_result, None
+            for matched in pending.values():
+                for url in matched:
+                    yield url, None, error_msg or "Failed to parse WhatWeb output"
             
         except Exception as e:
             error_msg = f"WhatWeb analysis failed: {str(e)}"
             logger.error(error_msg)
+            for matched in pending.values():
+                for url in matched:
+                    yield url, None, error_msg
+    
+    def start_worker_pool(self, size: int = 2, options: Dict[str, Any] = None) -> bool:
+        """Start long-lived WhatWeb processes that read target URLs from stdin"""
+        self.close_worker_pool()
+        self._worker_command = self.build_batch_command([], options or {})
+        for _ in range(size):
+            worker = self._spawn_worker()
+            if worker is None:
+                self.close_worker_pool()
+                return False
+            self._idle_workers.put(worker)
+        
+        logger.info(f"Started {size} persistent WhatWeb workers")
+        return True
+    
+    def close_worker_pool(self) -> None:
+        """Stop all persistent WhatWeb workers"""
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+            self._worker_command = None
+            self._idle_workers = queue.Queue()
+        
+        for worker in workers:
+            _kill_process_group(worker)
+            worker.wait()
+    
+    def _spawn_worker(self) -> Optional[subprocess.Popen]:
+        """Launch one WhatWeb process for the worker pool"""
+        try:
+            worker = subprocess.Popen(
+                self._worker_command + ["--input-file=/dev/stdin"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                start_new_session=True
+            )
+        except OSError as e:
+            logger.error(f"Failed to start WhatWeb worker: {e}")
+            return None
+        
+        with self._workers_lock:
+            self._workers.append(worker)
+        return worker
+    
+    def _release_worker(self, worker: subprocess.Popen) -> None:
+        """Return a worker to the idle queue, replacing it if it has exited"""
+        if worker.poll() is not None:
+            with self._workers_lock:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+            worker.wait()
+            if self._worker_command is None:
+                return
+            worker = self._spawn_worker()
+            if worker is None:
+                return
+        self._idle_workers.put(worker)
+    
+    def _analyze_with_worker(self, url: str, options: Dict[str, Any]) -> Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Analyze URL on a persistent worker; None means the caller should fall back to a one-shot run"""
+        dynamic_timeout = self.calculate_dynamic_timeout(url, options.get('timeout'))
+        try:
+            worker = self._idle_workers.get(timeout=dynamic_timeout)
+        except queue.Empty:
+            return None
+        
+        # Kill the worker if it stalls; the read loop then hits EOF
+        timed_out = threading.Event()
+        def _kill_stalled_worker():
+            timed_out.set()
+            _kill_process_group(worker)
+        timer = threading.Timer(dynamic_timeout, _kill_stalled_worker)
+        
+        target = _normalize_target(url)
+        start_time = time.time()
+        timer.start()
+        try:
+            worker.stdin.write(f"{url}\n")
+            worker.stdin.flush()
+            for line in worker.stdout:
+                for entry in self._iter_records(line):
+                    # Redirect hops from earlier targets are skipped here
+                    if _normalize_target(str(entry['target'])) == target:
+                        entry['execution_time'] = time.time() - start_time
+                        return entry, None
+        except (BrokenPipeError, OSError, ValueError) as e:
+            logger.debug(f"WhatWeb worker failed for {url}: {e}")
+        finally:
+            timer.cancel()
+            self._release_worker(worker)
+        
+        if timed_out.is_set():
+            error_msg = f"WhatWeb command timed out after {dynamic_timeout} seconds"
+            logger.warning(error_msg)
             return None, error_msg
+        return None
     
     def _parse_output(self, output: str, execution_time: float) -> Optional[Dict[str, Any]]:
         """Parse WhatWeb JSON output with enhanced error handling"""
         try:
             # Clean output - remove ANSI color codes and extra whitespace
-            output = re.sub(r'\x1b\[[0-9;]*m', '', output)  # Remove ANSI color codes
+            if '\x1b' in output:
+                output = _ANSI_RE.sub('', output)  # Remove ANSI color codes
             output = output.strip()
             if not output:
                 logger.debug("WhatWeb output is empty")
@@ -215,28 +521,12 @@ class DynamicWhatWebIntegration:
             except json.JSONDecodeError as e:
                 logger.debug(f"WhatWeb JSON decode error: {e}")
             
-            # Try to parse line by line
-            lines = output.split('\n')
-            logger.debug(f"WhatWeb trying line-by-line parsing, {len(lines)} lines")
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    data = json.loads(line)
-                    if isinstance(data, list) and len(data) > 0:
-                        result = data[0]
-                        if isinstance(result, dict) and self._is_valid_whatweb_output(result):
-                            result['execution_time'] = execution_time
-                            logger.debug(f"WhatWeb line {i} parsed successfully")
-                            return result
-                    elif isinstance(data, dict) and self._is_valid_whatweb_output(data):
-                        data['execution_time'] = execution_time
-                        logger.debug(f"WhatWeb line {i} parsed successfully")
-                        return data
-                except json.JSONDecodeError:
-                    continue
+            # Sweep the buffer for JSON objects, skipping any non-JSON text between them
+            for data in _iter_json_objects(output):
+                if self._is_valid_whatweb_output(data):
+                    data['execution_time'] = execution_time
+                    logger.debug("WhatWeb record recovered from mixed output")
+                    return data
             
             logger.debug("WhatWeb parsing failed completely")
             return None
@@ -245,19 +535,38 @@ class DynamicWhatWebIntegration:
             logger.error(f"Error parsing WhatWeb output: {e}")
             return None
     
+    def _iter_records(self, line: str):
+        """Yield the per-target WhatWeb records found on one line of JSON log output"""
+        if '\x1b' in line:
+            line = _ANSI_RE.sub('', line)  # Remove ANSI color codes
+        line = line.strip().strip(',')
+        if not line or line in ('[', ']'):
+            return
+        
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        
+        for entry in (data if isinstance(data, list) else [data]):
+            if isinstance(entry, dict) and 'target' in entry and self._is_valid_whatweb_output(entry):
+                yield entry
+    
     def _is_valid_whatweb_output(self, data: Dict[str, Any]) -> bool:
         """Check if data looks like valid WhatWeb output"""
-        return any(key in data for key in ['plugins', 'http_status', 'plugins_count', 'target'])
+        return not _WHATWEB_RECORD_KEYS.isdisjoint(data)
     
     def extract_technologies(self, whatweb_result: Dict[str, Any]) -> List[Any]:
         """Extract technologies from WhatWeb result"""
-        from ..core.enhanced_tech_detector import DetectionResult
-        
-        technologies = []
+        return list(self.iter_technologies(whatweb_result))
+    
+    def iter_technologies(self, whatweb_result: Dict[str, Any]) -> Iterator[Any]:
+        """Yield technologies from WhatWeb result one plugin record at a time"""
+        DetectionResult = _detection_result_cls()
         
         plugins = whatweb_result.get('plugins', {})
         if not isinstance(plugins, dict):
-            return technologies
+            return
         
         for plugin_name, plugin_data in plugins.items():
             if not plugin_data:
@@ -265,46 +574,12 @@ class DynamicWhatWebIntegration:
             
             # Handle different plugin data formats
             if isinstance(plugin_data, list):
-                for item in plugin_data:
-                    if isinstance(item, dict):
-                        tech = self._extract_technology_from_plugin(plugin_name, item)
-                        if tech:
-                            detection_result = DetectionResult(
-                                name=tech['name'],
-                                confidence=tech['confidence'],
-                                category=tech['category'],
-                                versions=tech['versions'],
-                                evidence=tech['evidence'],
-                                source=tech['source'],
-                                website=tech.get('website'),
-                                description=tech.get('description'),
-                                saas=tech.get('saas'),
-                                oss=tech.get('oss'),
-                                user_agent_used=tech.get('user_agent_used'),
-                                detection_time=tech.get('detection_time', 0.0)
-                            )
-                            technologies.append(detection_result)
+                items = [item for item in plugin_data if isinstance(item, dict)]
             elif isinstance(plugin_data, dict):
-                tech = self._extract_technology_from_plugin(plugin_name, plugin_data)
-                if tech:
-                    detection_result = DetectionResult(
-                        name=tech['name'],
-                        confidence=tech['confidence'],
-                        category=tech['category'],
-                        versions=tech['versions'],
-                        evidence=tech['evidence'],
-                        source=tech['source'],
-                        website=tech.get('website'),
-                        description=tech.get('description'),
-                        saas=tech.get('saas'),
-                        oss=tech.get('oss'),
-                        user_agent_used=tech.get('user_agent_used'),
-                        detection_time=tech.get('detection_time', 0.0)
-                    )
-                    technologies.append(detection_result)
+                items = [plugin_data]
             else:
                 # Simple string or other format
-                detection_result = DetectionResult(
+                yield DetectionResult(
                     name=plugin_name,
                     confidence=60,
                     category='WhatWeb Plugin',
@@ -319,47 +594,40 @@ class DynamicWhatWebIntegration:
                     source='whatweb',
                     description=f"WhatWeb detected: {plugin_name}"
                 )
-                technologies.append(detection_result)
-        
-        return technologies
+                continue
+            
+            for item in items:
+                detection_result = self._extract_technology_from_plugin(plugin_name, item)
+                if detection_result:
+                    yield detection_result
     
-    def _extract_technology_from_plugin(self, plugin_name: str, plugin_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Extract technology information from plugin data"""
+    def _extract_technology_from_plugin(self, plugin_name: str, plugin_data: Dict[str, Any]) -> Optional[Any]:
+        """Build a DetectionResult from plugin data"""
+        DetectionResult = _detection_result_cls()
+        
         try:
-            # Extract version
+            # Extract version; a missing key reads as None and is skipped like an explicit None
             versions = []
-            if 'version' in plugin_data:
-                version = str(plugin_data['version'])
-                if version and version != 'None':
-                    versions.append(version)
+            version_data = plugin_data.get('version')
+            if version_data is not None:
+                version_text = str(version_data)
+                if version_text and version_text != 'None':
+                    versions.append(version_text)
             
             # Extract additional versions from string field
-            if 'string' in plugin_data:
-                string_data = str(plugin_data['string'])
-                # Try to extract version from string
-                version_match = self._extract_version_from_string(string_data)
+            string_text = str(plugin_data['string']) if 'string' in plugin_data else None
+            if string_text is not None:
+                version_match = self._extract_version_from_string(string_text)
                 if version_match and version_match not in versions:
                     versions.append(version_match)
             
-            # Build evidence
+            # Build evidence from the templates, keeping their key order
             evidence = []
-            if 'string' in plugin_data:
-                evidence.append({
-                    'field': 'whatweb',
-                    'detail': 'plugin_string',
-                    'match': str(plugin_data['string']),
-                    'confidence': 60,
-                    'version': versions[0] if versions else None
-                })
+            if string_text is not None:
+                evidence.append({**_STRING_EVIDENCE, 'match': string_text, 'version': versions[0] if versions else None})
             
-            if 'version' in plugin_data and plugin_data['version']:
-                evidence.append({
-                    'field': 'whatweb',
-                    'detail': 'plugin_version',
-                    'match': str(plugin_data['version']),
-                    'confidence': 70,
-                    'version': str(plugin_data['version'])
-                })
+            if version_data:
+                evidence.append({**_VERSION_EVIDENCE, 'match': str(version_data), 'version': str(version_data)})
             
             # Determine confidence based on evidence
             confidence = 60
@@ -368,15 +636,15 @@ class DynamicWhatWebIntegration:
             if len(evidence) > 1:
                 confidence = 80
             
-            return {
-                'name': plugin_name,
-                'confidence': confidence,
-                'category': 'WhatWeb Plugin',
-                'versions': versions,
-                'evidence': evidence,
-                'source': 'whatweb',
-                'description': f"WhatWeb plugin: {plugin_name}"
-            }
+            return DetectionResult(
+                name=plugin_name,
+                confidence=confidence,
+                category='WhatWeb Plugin',
+                versions=versions,
+                evidence=evidence,
+                source='whatweb',
+                description=f"WhatWeb plugin: {plugin_name}"
+            )
             
         except Exception as e:
             logger.error(f"Error extracting technology from plugin {plugin_name}: {e}")
@@ -384,55 +652,49 @@ class DynamicWhatWebIntegration:
     
     def _extract_version_from_string(self, string_data: str) -> Optional[str]:
         """Extract version number from string data"""
-        # Simple version extraction patterns
-        version_patterns = [
-            r'v?(\d+\.\d+\.\d+)',
-            r'version[:\s]+(\d+\.\d+\.\d+)',
-            r'(\d+\.\d+\.\d+)',
-            r'v?(\d+\.\d+)',
-            r'(\d+\.\d+)'
-        ]
-        
-        for pattern in version_patterns:
-            match = re.search(pattern, string_data, re.IGNORECASE)
+        for pattern in _VERSION_RES:
+            match = pattern.search(string_data)
             if match:
                 return match.group(1)
         
         return None
 
 
-def merge_whatweb_results(base_results: List[Any], whatweb_results: List[Any]) -> List[Any]:
-    """Merge WhatWeb results with base detection results"""
-    # Create lookup for existing results (handle both dict and DetectionResult objects)
-    existing_names = set()
-    for result in base_results:
-        if hasattr(result, 'name'):
-            existing_names.add(result.name.lower())
-        elif isinstance(result, dict) and 'name' in result:
-            existing_names.add(result['name'].lower())
+def _name_of(item: Any) -> str:
+    """Lowercase name of a DetectionResult or result dict, '' if it has none"""
+    if hasattr(item, 'name'):
+        return item.name.lower()
+    if isinstance(item, dict):
+        return item.get('name', '').lower()
+    return ''
+
+
+def _confidence_of(item: Any) -> int:
+    """Confidence of a DetectionResult or result dict, 0 if it has none"""
+    if hasattr(item, 'confidence'):
+        return item.confidence
+    if isinstance(item, dict):
+        return item.get('confidence', 0)
+    return 0
+
+
+def merge_whatweb_results(base_results: Iterable[Any], whatweb_results: Iterable[Any],
+                          existing_names: Optional[Set[str]] = None) -> List[Any]:
+    """Merge WhatWeb results with base detection results
     
-    # Add WhatWeb results that don't already exist
+    Pass the same existing_names set to successive merges into one result list so the
+    lowercase name index is built once and updated as results are added.
+    """
     merged_results = list(base_results)
+    if existing_names is None:
+        existing_names = set(map(_name_of, merged_results))
     
+    # Add WhatWeb results that don't already exist; any iterable works, e.g. iter_technologies()
     for whatweb_result in whatweb_results:
-        if hasattr(whatweb_result, 'name'):
-            whatweb_name = whatweb_result.name.lower()
-        elif isinstance(whatweb_result, dict) and 'name' in whatweb_result:
-            whatweb_name = whatweb_result['name'].lower()
-        else:
-            continue
-            
+        whatweb_name = _name_of(whatweb_result)
         if whatweb_name and whatweb_name not in existing_names:
             merged_results.append(whatweb_result)
+            existing_names.add(whatweb_name)
     
-    # Sort by confidence (handle both dict and DetectionResult objects)
-    def get_confidence(item):
-        if hasattr(item, 'confidence'):
-            return item.confidence
-        elif isinstance(item, dict) and 'confidence' in item:
-            return item['confidence']
-        return 0
-    
-    merged_results.sort(key=get_confidence, reverse=True)
-    
+    merged_results.sort(key=_confidence_of, reverse=True)
     return merged_results
@@ -9,9 +9,11 @@ Handles both python-Wappalyzer library and direct JSON dataset usage.
 
 import json
 import logging
+import os
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,28 @@ except ImportError:
     WAPPALYZER_AVAILABLE = False
     logger.warning("python-Wappalyzer not available. Install with: pip install python-Wappalyzer")
 
+@lru_cache(maxsize=4)
+def _load_json_dataset(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON dataset once per path and modification time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@lru_cache(maxsize=4)
+def _build_custom_wappalyzer(path: str, mtime_ns: int) -> Tuple[Dict[str, Any], Any]:
+    """Build a Wappalyzer instance from a custom dataset once per path and modification time"""
+    # python-Wappalyzer prepares the technologies dict in place, so this parse is not shared
+    # with _load_json_dataset and is cached together with the instance built from it
+    with open(path, 'r', encoding='utf-8') as f:
+        technologies_data = json.load(f)
+    categories = technologies_data.get('categories', {})
+    technologies = technologies_data.get('technologies', {})
+    return technologies_data, PyWappalyzer(categories, technologies)
+
+def _dataset_key(path: Union[str, Path]) -> Tuple[str, int]:
+    """Cache key for a dataset file; a changed file gets a new key"""
+    resolved = str(Path(path).resolve())
+    return resolved, os.stat(resolved).st_mtime_ns
+
 class WappalyzerIntegration:
     """Advanced Wappalyzer integration with multiple detection methods"""
     
@@ -41,13 +65,9 @@ class WappalyzerIntegration:
         
         try:
             if self.wappalyzer_data_path and Path(self.wappalyzer_data_path).exists():
-                # Use custom dataset
-                with open(self.wappalyzer_data_path, 'r', encoding='utf-8') as f:
-                    self.technologies_data = json.load(f)
-                # Extract categories and technologies from custom data
-                categories = self.technologies_data.get('categories', {})
-                technologies = self.technologies_data.get('technologies', {})
-                self.wappalyzer_instance = PyWappalyzer(categories, technologies)
+                # Use custom dataset (parsed and built once per file version)
+                self.technologies_data, self.wappalyzer_instance = _build_custom_wappalyzer(
+                    *_dataset_key(self.wappalyzer_data_path))
                 logger.info(f"Loaded Wappalyzer from custom dataset: {self.wappalyzer_data_path}")
             else:
                 # Use default Wappalyzer with latest data
@@ -89,8 +109,7 @@ class WappalyzerIntegration:
             wappalyzer_file = datasets_dir / "wappalyzer_technologies_clean.json"
             
             if wappalyzer_file.exists():
-                with open(wappalyzer_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return _load_json_dataset(*_dataset_key(wappalyzer_file))
             
             # Fallback to online source
             import requests
@@ -431,15 +450,21 @@ class WappalyzerBatchProcessor:
         return results
 
 # Utility functions
-def merge_wappalyzer_results(base_results: List[Any], wappalyzer_results: List[Dict[str, Any]]) -> List[Any]:
-    """Merge Wappalyzer results with base detection results"""
+def merge_wappalyzer_results(base_results: List[Any], wappalyzer_results: List[Dict[str, Any]],
+                             existing_names: Optional[Set[str]] = None) -> List[Any]:
+    """Merge Wappalyzer results with base detection results
+    
+    Pass the same existing_names set to successive merges into one result list so the
+    lowercase name index is built once and updated as results are added.
+    """
     # Create lookup for existing results (handle both dict and DetectionResult objects)
-    existing_names = set()
-    for result in base_results:
-        if hasattr(result, 'name'):
-            existing_names.add(result.name.lower())
-        elif isinstance(result, dict) and 'name' in result:
-            existing_names.add(result['name'].lower())
+    if existing_names is None:
+        existing_names = set()
+        for result in base_results:
+            if hasattr(result, 'name'):
+                existing_names.add(result.name.lower())
+            elif isinstance(result, dict) and 'name' in result:
+                existing_names.add(result['name'].lower())
     
     # Add Wappalyzer results that don't already exist
     merged_results = list(base_results)
@@ -454,6 +479,7 @@ def merge_wappalyzer_results(base_results: List[Any], wappalyzer_results: List[D
             
         if wappalyzer_name and wappalyzer_name not in existing_names:
             merged_results.append(wappalyzer_result)
+            existing_names.add(wappalyzer_name)
     
     # Sort by confidence (handle both dict and DetectionResult objects)
     def get_confidence(item):
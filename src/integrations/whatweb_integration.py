@@ -7,16 +7,202 @@ Robust integration with WhatWeb for additional technology detection.
 Handles WhatWeb binary execution, output parsing, and result merging.
 """
 
+import asyncio
 import json
 import logging
+import os
+import re
+import shlex
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+# pysimdjson is optional; WhatWeb output falls back to the standard json module
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+# orjson is optional; it backs the JSON decode when simdjson is missing or rejects the input
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# uvloop is optional; batch runs use it for their event loop without installing it globally
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# ijson is optional; with it, technologies are extracted from output one plugin at a time
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Version patterns, tried in order: a three-part version anywhere wins over a two-part one.
+# A leading "v" or "version:" never changes the captured group, so neither is matched.
+_VERSION_RES = (
+    re.compile(r'(\d+\.\d+\.\d+)'),  # 1.2.3
+    re.compile(r'(\d+\.\d+)'),        # 1.2
+)
+
+# simdjson parsers reuse their internal buffers and are not thread-safe, so keep one per thread
+_parser_state = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _detection_result_cls():
+    """Import DetectionResult once, on first use, to keep module import free of src.core"""
+    from ..core.enhanced_tech_detector import DetectionResult
+    return DetectionResult
+
+
+def _kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session=True together with its children"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups on this platform, or the group is already gone
+        process.kill()
+
+
+def _first_record_events(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Tuple[str, str, Any]]:
+    """Pass ijson events through until the first WhatWeb record is complete"""
+    depth = 0
+    record_depth = None
+    for prefix, event, value in events:
+        yield prefix, event, value
+        if event in ('start_map', 'start_array'):
+            if record_depth is None:
+                # A top-level array holds one record per target; a top-level object is the record
+                record_depth = 1 if event == 'start_array' else 0
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+            if depth == record_depth:
+                return
+
+
+def _normalize_target(url: str) -> str:
+    """Normalize a URL the way WhatWeb reports it as a target"""
+    if '://' not in url:
+        url = f"http://{url}"
+    return url.rstrip('/')
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON with simdjson when available, else orjson, else the standard json module
+    
+    Invalid input is re-decoded with orjson or json so callers still get a JSONDecodeError with its position.
+    """
+    if SIMDJSON_AVAILABLE:
+        parser = getattr(_parser_state, 'parser', None)
+        if parser is None:
+            parser = _parser_state.parser = simdjson.Parser()
+        try:
+            return parser.parse(data, recursive=True)
+        except ValueError:
+            pass
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Plugin lists survive restarts here, keyed by binary path and modification time
+_PLUGIN_CACHE_FILE = Path(os.path.expanduser('~')) / '.cache' / 'whatweb_plugins.json'
+
+
+def _binary_key(whatweb_path: str) -> Tuple[str, int]:
+    """Cache key for a WhatWeb binary; a reinstalled or missing binary gets a new key"""
+    resolved = shutil.which(whatweb_path) or whatweb_path
+    try:
+        return whatweb_path, os.stat(resolved).st_mtime_ns
+    except OSError:
+        return whatweb_path, 0
+
+
+@lru_cache(maxsize=8)
+def _whatweb_available(whatweb_path: str, mtime_ns: int) -> bool:
+    """Run 'whatweb --version' once per binary version"""
+    try:
+        result = subprocess.run(
+            [whatweb_path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        if result.returncode == 0:
+            logger.info(f"WhatWeb found: {result.stdout.strip()}")
+            return True
+        else:
+            logger.warning(f"WhatWeb version check failed: {result.stderr}")
+            return False
+    except FileNotFoundError:
+        logger.error(f"WhatWeb not found at path: {whatweb_path}")
+        return False
+    except subprocess.TimeoutExpired:
+        logger.error("WhatWeb version check timed out")
+        return False
+    except Exception as e:
+        logger.error(f"WhatWeb availability check failed: {e}")
+        return False
+
+
+@lru_cache(maxsize=8)
+def _load_plugin_list(whatweb_path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Run 'whatweb --list' once per binary version, reusing the on-disk cache across restarts
+    
+    Failures raise instead of returning, so they are not cached.
+    """
+    cache_key = os.path.abspath(whatweb_path)
+    try:
+        disk_cache = json.loads(_PLUGIN_CACHE_FILE.read_text(encoding='utf-8'))
+        entry = disk_cache.get(cache_key)
+        if entry and entry.get('mtime_ns') == mtime_ns:
+            return tuple(entry['plugins'])
+    except (OSError, ValueError, AttributeError):
+        disk_cache = {}
+    
+    result = subprocess.run(
+        [whatweb_path, "--list"],
+        capture_output=True,
+        timeout=10
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to get plugin list: {result.stderr.decode('utf-8', 'replace')}")
+    
+    # Only the kept lines are decoded
+    plugins = []
+    for line in result.stdout.splitlines():
+        line = line.strip()
+        if line and not line.startswith(b'#'):
+            plugins.append(line.decode('utf-8', 'replace'))
+    
+    if not isinstance(disk_cache, dict):
+        disk_cache = {}
+    disk_cache[cache_key] = {'mtime_ns': mtime_ns, 'plugins': plugins}
+    try:
+        _PLUGIN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _PLUGIN_CACHE_FILE.write_text(json.dumps(disk_cache), encoding='utf-8')
+    except OSError as e:
+        logger.debug(f"Could not write WhatWeb plugin cache: {e}")
+    return tuple(plugins)
+
+
 class WhatWebIntegration:
     """WhatWeb integration with advanced error handling and optimization"""
     
@@ -26,33 +212,93 @@ class WhatWebIntegration:
         self._check_whatweb_availability()
     
     def _check_whatweb_availability(self) -> bool:
-        """Check if WhatWeb is available and working"""
+        """Check if WhatWeb is available and working (cached per binary)"""
+        return _whatweb_available(*_binary_key(self.whatweb_path))
+    
+    def analyze_url(self, url: str, options: Dict[str, Any] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Analyze URL with WhatWeb
+        
+        Args:
+            url: URL to analyze
+            options: Analysis options
+            
+        Returns:
+            Tuple of (results_dict, error_message)
+        """
+        options = options or {}
+        
         try:
-            result = subprocess.run(
-                [self.whatweb_path, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                logger.info(f"WhatWeb found: {result.stdout.strip()}")
-                return True
-            else:
-                logger.warning(f"WhatWeb version check failed: {result.stderr}")
-                return False
-        except FileNotFoundError:
-            logger.error(f"WhatWeb not found at path: {self.whatweb_path}")
-            return False
+            # Build WhatWeb command
+            cmd = self._build_command(url, options)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Running WhatWeb command: {shlex.join(cmd)}")
+            
+            # Execute WhatWeb, reading its output as it streams and stopping at the first record
+            start_time = time.time()
+            timed_out = threading.Event()
+            parsed_result = None
+            unparsed = []
+            with tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, start_new_session=True)
+                def _kill_stalled_process():
+                    timed_out.set()
+                    _kill_process_group(process)
+                timer = threading.Timer(self.timeout, _kill_stalled_process)
+                timer.start()
+                try:
+                    for line in process.stdout:
+                        parsed_result = self._parse_record_line(line)
+                        if parsed_result is not None:
+                            break
+                        unparsed.append(line)
+                finally:
+                    timer.cancel()
+                    if process.poll() is None:
+                        # Only the first record is used; the rest of the scan is not needed
+                        process.terminate()
+                    process.stdout.close()
+                    try:
+                        returncode = process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        _kill_process_group(process)
+                        returncode = process.wait()
+                execution_time = time.time() - start_time
+                
+                if parsed_result is not None:
+                    parsed_result['execution_time'] = execution_time
+                    return parsed_result, None
+                
+                if timed_out.is_set():
+                    error_msg = f"WhatWeb command timed out after {self.timeout} seconds"
+                    logger.error(error_msg)
+                    return None, error_msg
+                
+                if returncode != 0:
+                    stderr_file.seek(0)
+                    error_msg = f"WhatWeb execution failed (exit code {returncode}): {stderr_file.read().decode('utf-8', 'replace')}"
+                    logger.error(error_msg)
+                    return None, error_msg
+            
+            # No record on a line of its own; parse the collected output as a whole
+            parsed_result = self._parse_output(b''.join(unparsed), execution_time)
+            if parsed_result is None:
+                return None, "Failed to parse WhatWeb output"
+            
+            return parsed_result, None
+            
         except subprocess.TimeoutExpired:
-            logger.error("WhatWeb version check timed out")
-            return False
+            error_msg = f"WhatWeb analysis timed out after {self.timeout} seconds"
+            logger.error(error_msg)
+            return None, error_msg
         except Exception as e:
-            logger.error(f"WhatWeb availability check failed: {e}")
-            return False
+            error_msg = f"WhatWeb analysis failed: {str(e)}"
+            logger.error(error_msg)
+            return None, error_msg
     
-    def analyze_url(self, url: str, options: Dict[str, Any] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    async def analyze_url_async(self, url: str, options: Dict[str, Any] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
-        Analyze URL with WhatWeb
+        Analyze URL with WhatWeb without blocking the event loop
         
         Args:
             url: URL to analyze
@@ -66,40 +312,39 @@ class WhatWebIntegration:
         try:
             # Build WhatWeb command
             cmd = self._build_command(url, options)
-            logger.debug(f"Running WhatWeb command: {' '.join(cmd)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Running WhatWeb command: {shlex.join(cmd)}")
             
             # Execute WhatWeb
             start_time = time.time()
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
             try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout
-                )
-                execution_time = time.time() - start_time
-            except subprocess.TimeoutExpired:
-                execution_time = time.time() - start_time
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                _kill_process_group(process)
+                await process.wait()
                 error_msg = f"WhatWeb command timed out after {self.timeout} seconds"
                 logger.error(error_msg)
                 return None, error_msg
+            execution_time = time.time() - start_time
             
-            if result.returncode != 0:
-                error_msg = f"WhatWeb execution failed (exit code {result.returncode}): {result.stderr}"
+            if process.returncode != 0:
+                error_msg = f"WhatWeb execution failed (exit code {process.returncode}): {stderr.decode('utf-8', 'replace')}"
                 logger.error(error_msg)
                 return None, error_msg
             
             # Parse output
-            parsed_result = self._parse_output(result.stdout, execution_time)
+            parsed_result = self._parse_output(stdout, execution_time)
             if parsed_result is None:
                 return None, "Failed to parse WhatWeb output"
             
             return parsed_result, None
             
-        except subprocess.TimeoutExpired:
-            error_msg = f"WhatWeb analysis timed out after {self.timeout} seconds"
-            logger.error(error_msg)
-            return None, error_msg
         except Exception as e:
             error_msg = f"WhatWeb analysis failed: {str(e)}"
             logger.error(error_msg)
@@ -107,7 +352,13 @@ class WhatWebIntegration:
     
     def _build_command(self, url: str, options: Dict[str, Any]) -> List[str]:
         """Build WhatWeb command with options"""
-        cmd = [self.whatweb_path, url, "--log-json=-"]
+        return [self.whatweb_path, url, *self._build_options(options)]
+    
+    def _build_options(self, options: Dict[str, Any]) -> List[str]:
+        """Build the WhatWeb arguments that follow the target"""
+        # Verbose JSON replaces --verbose so stdout stays a clean JSON log without colors or brief output
+        log_option = "--log-json-verbose=-" if options.get('verbose', False) else "--log-json=-"
+        cmd = [log_option, "--color=never", "--quiet"]
         
         # Aggression level (limit to max 1 to avoid timeouts)
         if 'aggression' in options:
@@ -134,67 +385,73 @@ class WhatWebIntegration:
         # Follow redirects (WhatWeb follows redirects by default)
         # No need to add specific redirect parameters
         
-        # Verbose output
-        if options.get('verbose', False):
-            cmd.append("--verbose")
-        
         # Custom timeout (WhatWeb doesn't support --timeout parameter)
         # We'll handle timeout at the subprocess level
         
         return cmd
     
-    def _parse_output(self, output: str, execution_time: float) -> Optional[Dict[str, Any]]:
-        """Parse WhatWeb JSON output"""
+    def _parse_output(self, output: Union[str, bytes], execution_time: float) -> Optional[Dict[str, Any]]:
+        """Parse WhatWeb JSON output, kept as raw bytes so it is never decoded to str first"""
         try:
-            # Clean output - remove ANSI color codes and extra whitespace
-            import re
-            output = re.sub(r'\x1b\[[0-9;]*m', '', output)  # Remove ANSI color codes
+            if isinstance(output, str):
+                output = output.encode('utf-8')
+            
+            # Commands run with --color=never, so only surrounding whitespace needs removing
             output = output.strip()
             if not output:
                 logger.debug("WhatWeb output is empty")
                 return None
             
-            logger.debug(f"WhatWeb output length: {len(output)}")
-            logger.debug(f"WhatWeb output first 200 chars: {repr(output[:200])}")
+            # Formatting these messages costs more than parsing small outputs, so skip it unless it is logged
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(f"WhatWeb output length: {len(output)}")
+                logger.debug(f"WhatWeb output first 200 chars: {repr(output[:200])}")
             
             # WhatWeb outputs an array of results, we want the first one
             try:
-                data = json.loads(output)
-                logger.debug(f"WhatWeb parsed as JSON successfully, type: {type(data)}")
+                data = _json_loads(output)
+                if debug:
+                    logger.debug(f"WhatWeb parsed as JSON successfully, type: {type(data)}")
                 if isinstance(data, list) and len(data) > 0:
                     # Get the first result
                     result = data[0]
                     if isinstance(result, dict):
                         result['execution_time'] = execution_time
-                        logger.debug(f"WhatWeb first result keys: {list(result.keys())}")
+                        if debug:
+                            logger.debug(f"WhatWeb first result keys: {list(result.keys())}")
                         return result
                 elif isinstance(data, dict):
                     data['execution_time'] = execution_time
-                    logger.debug(f"WhatWeb single result keys: {list(data.keys())}")
+                    if debug:
+                        logger.debug(f"WhatWeb single result keys: {list(data.keys())}")
                     return data
             except json.JSONDecodeError as e:
                 logger.debug(f"WhatWeb JSON decode error: {e}")
                 logger.debug(f"Problematic part: {output[max(0, e.pos-50):e.pos+50]}")
             
             # Try to parse line by line
-            lines = output.split('\n')
-            logger.debug(f"WhatWeb trying line-by-line parsing, {len(lines)} lines")
+            lines = output.split(b'\n')
+            if debug:
+                logger.debug(f"WhatWeb trying line-by-line parsing, {len(lines)} lines")
             for i, line in enumerate(lines):
                 line = line.strip()
                 if not line:
                     continue
                 
                 try:
-                    data = json.loads(line)
+                    data = _json_loads(line)
                     if isinstance(data, list) and len(data) > 0:
                         result = data[0]
                         if isinstance(result, dict) and self._is_valid_whatweb_output(result):
                             result['execution_time'] = execution_time
-                            logger.debug(f"WhatWeb line {i} parsed successfully")
+                            if debug:
+                                logger.debug(f"WhatWeb line {i} parsed successfully")
                             return result
                     elif isinstance(data, dict) and self._is_valid_whatweb_output(data):
                         data['execution_time'] = execution_time
-                        logger.debug(f"WhatWeb line {i} parsed successfully")
+                        if debug:
+                            logger.debug(f"WhatWeb line {i} parsed successfully")
                         return data
                 except json.JSONDecodeError:
                     continue
@@ -206,14 +463,29 @@ class WhatWebIntegration:
             logger.error(f"Error parsing WhatWeb output: {e}")
             return None
     
+    def _parse_record_line(self, line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse one raw line of WhatWeb JSON log output, returning its first valid record if any"""
+        if b'{' not in line:
+            return None
+        
+        line = line.strip().strip(b',')
+        try:
+            data = _json_loads(line)
+        except json.JSONDecodeError:
+            return None
+        
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if isinstance(data, dict) and self._is_valid_whatweb_output(data):
+            return data
+        return None
+    
     def _is_valid_whatweb_output(self, data: Dict[str, Any]) -> bool:
         """Check if data looks like valid WhatWeb output"""
         return any(key in data for key in ['plugins', 'http_status', 'plugins_count', 'target'])
     
     def extract_technologies(self, whatweb_result: Dict[str, Any]) -> List[Any]:
         """Extract technologies from WhatWeb result"""
-        from ..core.enhanced_tech_detector import DetectionResult
-        
         technologies = []
         
         plugins = whatweb_result.get('plugins', {})
@@ -221,84 +493,113 @@ class WhatWebIntegration:
             return technologies
         
         for plugin_name, plugin_data in plugins.items():
-            if not plugin_data:
-                continue
-            
-            # Handle different plugin data formats
+            technologies.extend(self._plugin_technologies(plugin_name, plugin_data))
+        
+        return technologies
+    
+    def extract_technologies_from_output(self, output: Union[str, bytes]) -> List[Any]:
+        """Extract technologies straight from raw WhatWeb JSON output
+        
+        With ijson, only one plugin entry of the first record is materialized at a time instead of
+        the whole record; otherwise the output is parsed with _parse_output first.
+        """
+        if isinstance(output, str):
+            output = output.encode('utf-8')
+        
+        if IJSON_AVAILABLE:
+            stripped = output.lstrip()
+            if stripped.startswith(b'['):
+                prefix = 'item.plugins'
+            elif stripped.startswith(b'{'):
+                prefix = 'plugins'
+            else:
+                prefix = None
+            if prefix is not None:
+                try:
+                    technologies = []
+                    events = _first_record_events(ijson.parse(stripped, use_float=True))
+                    for plugin_name, plugin_data in ijson.kvitems(events, prefix):
+                        technologies.extend(self._plugin_technologies(plugin_name, plugin_data))
+                    return technologies
+                except ijson.JSONError as e:
+                    logger.debug(f"WhatWeb output not streamable, parsing it whole: {e}")
+        
+        whatweb_result = self._parse_output(output, 0.0)
+        return self.extract_technologies(whatweb_result) if whatweb_result else []
+    
+    def _plugin_technologies(self, plugin_name: str, plugin_data: Any) -> List[Any]:
+        """Build the DetectionResults for one WhatWeb plugin entry"""
+        technologies = []
+        if not plugin_data:
+            return technologies
+        
+        # Handle different plugin data formats; exact JSON types hit the table, subclasses fall back to isinstance
+        handler = self._PLUGIN_HANDLERS.get(type(plugin_data))
+        if handler is None:
             if isinstance(plugin_data, list):
-                for item in plugin_data:
-                    if isinstance(item, dict):
-                        tech = self._extract_technology_from_plugin(plugin_name, item)
-                        if tech:
-                            # Convert to DetectionResult
-                            detection_result = DetectionResult(
-                                name=tech['name'],
-                                confidence=tech['confidence'],
-                                category=tech['category'],
-                                versions=tech['versions'],
-                                evidence=tech['evidence'],
-                                source=tech['source'],
-                                website=tech.get('website'),
-                                description=tech.get('description'),
-                                saas=tech.get('saas'),
-                                oss=tech.get('oss'),
-                                user_agent_used=tech.get('user_agent_used'),
-                                detection_time=tech.get('detection_time', 0.0)
-                            )
-                            technologies.append(detection_result)
+                handler = WhatWebIntegration._add_list_technologies
             elif isinstance(plugin_data, dict):
-                tech = self._extract_technology_from_plugin(plugin_name, plugin_data)
-                if tech:
-                    # Convert to DetectionResult
-                    detection_result = DetectionResult(
-                        name=tech['name'],
-                        confidence=tech['confidence'],
-                        category=tech['category'],
-                        versions=tech['versions'],
-                        evidence=tech['evidence'],
-                        source=tech['source'],
-                        website=tech.get('website'),
-                        description=tech.get('description'),
-                        saas=tech.get('saas'),
-                        oss=tech.get('oss'),
-                        user_agent_used=tech.get('user_agent_used'),
-                        detection_time=tech.get('detection_time', 0.0)
-                    )
-                    technologies.append(detection_result)
+                handler = WhatWebIntegration._add_dict_technologies
             else:
-                # Simple string or other format
-                detection_result = DetectionResult(
-                    name=plugin_name,
-                    confidence=60,
-                    category='WhatWeb Plugin',
-                    versions=[],
-                    evidence=[{
-                        'field': 'whatweb',
-                        'detail': 'plugin',
-                        'match': str(plugin_data),
-                        'confidence': 60,
-                        'version': None
-                    }],
-                    source='whatweb',
-                    description=f"WhatWeb detected: {plugin_name}"
-                )
-                technologies.append(detection_result)
-        
+                handler = WhatWebIntegration._add_scalar_technology
+        handler(self, plugin_name, plugin_data, technologies)
         return technologies
     
-    def _extract_technology_from_plugin(self, plugin_name: str, plugin_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Extract technology information from plugin data"""
+    def _add_list_technologies(self, plugin_name: str, plugin_data: List[Any], technologies: List[Any]) -> None:
+        """Append a DetectionResult for each dict entry of a list plugin"""
+        for item in plugin_data:
+            if isinstance(item, dict):
+                self._add_dict_technologies(plugin_name, item, technologies)
+    
+    def _add_dict_technologies(self, plugin_name: str, plugin_data: Dict[str, Any], technologies: List[Any]) -> None:
+        """Append the DetectionResult for a dict plugin"""
+        detection_result = self._extract_technology_from_plugin(plugin_name, plugin_data)
+        if detection_result:
+            technologies.append(detection_result)
+    
+    def _add_scalar_technology(self, plugin_name: str, plugin_data: Any, technologies: List[Any]) -> None:
+        """Append the DetectionResult for a simple string or other plugin format"""
+        DetectionResult = _detection_result_cls()
+        # Positional in field order: name, confidence, category, versions, evidence, source, website, description
+        technologies.append(DetectionResult(
+            plugin_name,
+            60,
+            'WhatWeb Plugin',
+            [],
+            [{
+                'field': 'whatweb',
+                'detail': 'plugin',
+                'match': str(plugin_data),
+                'confidence': 60,
+                'version': None
+            }],
+            'whatweb',
+            None,
+            f"WhatWeb detected: {plugin_name}"
+        ))
+    
+    _PLUGIN_HANDLERS = {
+        list: _add_list_technologies,
+        dict: _add_dict_technologies,
+        str: _add_scalar_technology,
+    }
+    
+    def _extract_technology_from_plugin(self, plugin_name: str, plugin_data: Dict[str, Any]) -> Optional[Any]:
+        """Build a DetectionResult from plugin data"""
+        DetectionResult = _detection_result_cls()
+        
         try:
             # Extract version
             versions = []
-            if 'version' in plugin_data:
-                version = str(plugin_data['version'])
+            version_data = plugin_data.get('version')
+            if version_data is not None:
+                version = str(version_data)
                 if version and version != 'None':
                     versions.append(version)
             
             # Extract additional versions from string field
-            if 'string' in plugin_data:
-                string_data = str(plugin_data['string'])
+            string_data = str(plugin_data['string']) if 'string' in plugin_data else None
+            if string_data is not None:
                 # Try to extract version from string
                 version_match = self._extract_version_from_string(string_data)
                 if version_match and version_match not in versions:
@@ -306,22 +607,22 @@ class WhatWebIntegration:
             
             # Build evidence
             evidence = []
-            if 'string' in plugin_data:
+            if string_data is not None:
                 evidence.append({
                     'field': 'whatweb',
                     'detail': 'plugin_string',
-                    'match': str(plugin_data['string']),
+                    'match': string_data,
                     'confidence': 60,
                     'version': versions[0] if versions else None
                 })
             
-            if 'version' in plugin_data and plugin_data['version']:
+            if version_data:
                 evidence.append({
                     'field': 'whatweb',
                     'detail': 'plugin_version',
-                    'match': str(plugin_data['version']),
+                    'match': str(version_data),
                     'confidence': 70,
-                    'version': str(plugin_data['version'])
+                    'version': str(version_data)
                 })
             
             # Determine confidence based on evidence
@@ -331,15 +632,17 @@ class WhatWebIntegration:
             if len(evidence) > 1:
                 confidence = 80
             
-            return {
-                'name': plugin_name,
-                'confidence': confidence,
-                'category': 'WhatWeb Plugin',
-                'versions': versions,
-                'evidence': evidence,
-                'source': 'whatweb',
-                'description': f"WhatWeb plugin: {plugin_name}"
-            }
+            # Positional in field order: name, confidence, category, versions, evidence, source, website, description
+            return DetectionResult(
+                plugin_name,
+                confidence,
+                'WhatWeb Plugin',
+                versions,
+                evidence,
+                'whatweb',
+                None,
+                f"WhatWeb plugin: {plugin_name}"
+            )
             
         except Exception as e:
             logger.debug(f"Error extracting technology from plugin {plugin_name}: {e}")
@@ -347,44 +650,17 @@ class WhatWebIntegration:
     
     def _extract_version_from_string(self, string_data: str) -> Optional[str]:
         """Extract version number from string data"""
-        import re
-        
-        # Common version patterns
-        version_patterns = [
-            r'v?(\d+\.\d+\.\d+)',  # v1.2.3 or 1.2.3
-            r'v?(\d+\.\d+)',       # v1.2 or 1.2
-            r'version\s*:?\s*(\d+\.\d+\.\d+)',  # version: 1.2.3
-            r'version\s*:?\s*(\d+\.\d+)',       # version: 1.2
-        ]
-        
-        for pattern in version_patterns:
-            match = re.search(pattern, string_data, re.IGNORECASE)
+        for pattern in _VERSION_RES:
+            match = pattern.search(string_data)
             if match:
                 return match.group(1)
         
         return None
     
     def get_available_plugins(self) -> List[str]:
-        """Get list of available WhatWeb plugins"""
+        """Get list of available WhatWeb plugins (cached per binary, also on disk)"""
         try:
-            result = subprocess.run(
-                [self.whatweb_path, "--list"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                plugins = []
-                for line in result.stdout.split('\n'):
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        plugins.append(line)
-                return plugins
-            else:
-                logger.warning(f"Failed to get plugin list: {result.stderr}")
-                return []
-                
+            return list(_load_plugin_list(*_binary_key(self.whatweb_path)))
         except Exception as e:
             logger.error(f"Error getting plugin list: {e}")
             return []
@@ -421,84 +697,211 @@ class WhatWebIntegration:
                 'error': str(e)
             }
 
+class WhatWebDaemon:
+    """Long-running WhatWeb process that scans URLs written to its stdin
+    
+    Ruby and the plugin set are loaded once per daemon instead of once per URL.
+    """
+    
+    def __init__(self, whatweb_integration: WhatWebIntegration, options: Dict[str, Any] = None):
+        self.whatweb = whatweb_integration
+        self.options = options or {}
+        self.process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> 'WhatWebDaemon':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def start(self) -> bool:
+        """Start the WhatWeb process unless it is already running"""
+        if self.process is not None and self.process.poll() is None:
+            return True
+        
+        cmd = [self.whatweb.whatweb_path, "--input-file=/dev/stdin", *self.whatweb._build_options(self.options)]
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except OSError as e:
+            logger.error(f"Failed to start WhatWeb daemon: {e}")
+            self.process = None
+            return False
+        return True
+    
+    def close(self) -> None:
+        """Stop the WhatWeb process"""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            _kill_process_group(process)
+        process.wait()
+        for pipe in (process.stdin, process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+    
+    def analyze_url(self, url: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Analyze URL on the running WhatWeb process, starting a fresh one if it died or stalled"""
+        with self._lock:
+            if not self.start():
+                return None, "WhatWeb daemon could not be started"
+            
+            process = self.process
+            timed_out = threading.Event()
+            def _kill_stalled_process():
+                timed_out.set()
+                _kill_process_group(process)
+            timer = threading.Timer(self.whatweb.timeout, _kill_stalled_process)
+            
+            target = _normalize_target(url)
+            start_time = time.time()
+            timer.start()
+            try:
+                process.stdin.write(f"{url}\n".encode('utf-8'))
+                process.stdin.flush()
+                for line in process.stdout:
+                    parsed_result = self.whatweb._parse_record_line(line)
+                    # Records for other targets are redirect hops of earlier URLs
+                    if parsed_result is not None and _normalize_target(str(parsed_result.get('target', ''))) == target:
+                        parsed_result['execution_time'] = time.time() - start_time
+                        return parsed_result, None
+            except (OSError, ValueError) as e:
+                logger.debug(f"WhatWeb daemon failed for {url}: {e}")
+            finally:
+                timer.cancel()
+            
+            # The process exited or was killed; the next call starts a new one
+            self.close()
+            if timed_out.is_set():
+                error_msg = f"WhatWeb command timed out after {self.whatweb.timeout} seconds"
+            else:
+                error_msg = "WhatWeb daemon exited before returning a result"
+            logger.error(error_msg)
+            return None, error_msg
+
 class WhatWebBatchProcessor:
     """Batch processing for WhatWeb analysis"""
     
-    def __init__(self, whatweb_integration: WhatWebIntegration, max_workers: int = 5):
+    def __init__(self, whatweb_integration: WhatWebIntegration, max_workers: Optional[int] = None):
         self.whatweb = whatweb_integration
         self.max_workers = max_workers
     
-    def process_urls(self, urls: List[str], options: Dict[str, Any] = None) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
-        """Process multiple URLs with WhatWeb"""
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+    def _worker_count(self, url_count: int) -> int:
+        """Concurrency for a batch: max_workers if set, else sized for network-bound scans"""
+        if self.max_workers:
+            return self.max_workers
+        return max(1, min(url_count, (os.cpu_count() or 1) * 4))
+    
+    def process_urls(self, urls: List[str], options: Dict[str, Any] = None,
+                     use_daemons: bool = False) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Process multiple URLs with WhatWeb
         
-        results = []
+        use_daemons opts into persistent processes fed over stdin; by default each URL gets its own process.
+        """
+        run = uvloop.run if UVLOOP_AVAILABLE else asyncio.run
+        if use_daemons:
+            return run(self.process_urls_with_daemons(urls, options))
+        return run(self.process_urls_async(urls, options))
+    
+    async def process_urls_async(self, urls: List[str], options: Dict[str, Any] = None) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Process multiple URLs as concurrent WhatWeb subprocesses, at most _worker_count() at a time"""
         options = options or {}
+        semaphore = asyncio.Semaphore(self._worker_count(len(urls)))
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_url = {
-                executor.submit(self.whatweb.analyze_url, url, options): url 
-                for url in urls
-            }
-            
-            # Collect results
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
+        async def _process(url: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+            async with semaphore:
                 try:
-                    result, error = future.result()
-                    results.append((url, result, error))
+                    result, error = await self.whatweb.analyze_url_async(url, options)
+                    return url, result, error
                 except Exception as e:
-                    results.append((url, None, str(e)))
+                    return url, None, str(e)
         
-        return results
+        return list(await asyncio.gather(*(_process(url) for url in urls)))
+    
+    async def process_urls_with_daemons(self, urls: List[str], options: Dict[str, Any] = None) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Process multiple URLs across at most _worker_count() persistent WhatWeb daemons"""
+        daemons = [WhatWebDaemon(self.whatweb, options) for _ in range(min(self._worker_count(len(urls)), len(urls)))]
+        idle: asyncio.Queue = asyncio.Queue()
+        for daemon in daemons:
+            idle.put_nowait(daemon)
+        
+        async def _process(url: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+            daemon = await idle.get()
+            try:
+                result, error = await asyncio.to_thread(daemon.analyze_url, url)
+                return url, result, error
+            except Exception as e:
+                return url, None, str(e)
+            finally:
+                idle.put_nowait(daemon)
+        
+        try:
+            return list(await asyncio.gather(*(_process(url) for url in urls)))
+        finally:
+            for daemon in daemons:
+                daemon.close()
 
 # Utility functions
-def merge_whatweb_results(base_results: List[Any], whatweb_results: List[Any]) -> List[Any]:
-    """Merge WhatWeb results with base detection results"""
-    # Create lookup for existing results (handle both dict and DetectionResult objects)
-    existing_names = set()
-    for result in base_results:
-        if hasattr(result, 'name'):
-            existing_names.add(result.name.lower())
-        elif isinstance(result, dict) and 'name' in result:
-            existing_names.add(result['name'].lower())
+def _name_of(item: Any) -> Optional[str]:
+    """Lowercase name of a DetectionResult or result dict, None if it has none"""
+    if hasattr(item, 'name'):
+        return item.name.lower()
+    if isinstance(item, dict) and 'name' in item:
+        return item['name'].lower()
+    return None
+
+def _confidence_of(item: Any) -> int:
+    """Confidence of a DetectionResult or result dict, 0 if it has none"""
+    if hasattr(item, 'confidence'):
+        return item.confidence
+    if isinstance(item, dict):
+        return item.get('confidence', 0)
+    return 0
+
+def merge_whatweb_results(base_results: List[Any], whatweb_results: List[Any],
+                          existing_names: Optional[Set[str]] = None) -> List[Any]:
+    """Merge WhatWeb results with base detection results
     
-    # Add WhatWeb results that don't already exist
+    Pass the same existing_names set to successive merges into one result list so the
+    lowercase name index is built once and updated as results are added.
+    """
     merged_results = list(base_results)
+    if existing_names is None:
+        existing_names = set(map(_name_of, merged_results))
+        existing_names.discard(None)
     
+    # Add WhatWeb results that don't already exist
     for whatweb_result in whatweb_results:
-        if hasattr(whatweb_result, 'name'):
-            whatweb_name = whatweb_result.name.lower()
-        elif isinstance(whatweb_result, dict) and 'name' in whatweb_result:
-            whatweb_name = whatweb_result['name'].lower()
-        else:
-            continue
-            
-        if whatweb_name not in existing_names:
+        whatweb_name = _name_of(whatweb_result)
+        if whatweb_name is not None and whatweb_name not in existing_names:
             merged_results.append(whatweb_result)
+            existing_names.add(whatweb_name)
     
-    # Sort by confidence (handle both dict and DetectionResult objects)
-    def get_confidence(item):
-        if hasattr(item, 'confidence'):
-            return item.confidence
-        elif isinstance(item, dict) and 'confidence' in item:
-            return item['confidence']
-        return 0
-    
-    merged_results.sort(key=get_confidence, reverse=True)
-    
+    # sort() computes each key once, so confidence is read once per item
+    merged_results.sort(key=_confidence_of, reverse=True)
     return merged_results
 
 def create_whatweb_summary(whatweb_result: Dict[str, Any]) -> Dict[str, Any]:
     """Create a summary of WhatWeb analysis"""
-    plugins = whatweb_result.get('plugins', {})
+    plugins_detected = list(whatweb_result.get('plugins', {}))
+    # Only read the clock when the result carries no timestamp of its own
+    timestamp = whatweb_result['timestamp'] if 'timestamp' in whatweb_result else time.time()
     
     return {
-        'total_plugins': len(plugins),
-        'plugins_detected': list(plugins.keys()),
+        'total_plugins': len(plugins_detected),
+        'plugins_detected': plugins_detected,
         'http_status': whatweb_result.get('http_status'),
         'target': whatweb_result.get('target'),
         'execution_time': whatweb_result.get('execution_time', 0),
-        'timestamp': whatweb_result.get('timestamp', time.time())
+        'timestamp': timestamp
     }
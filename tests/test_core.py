@@ -0,0 +1,191 @@
+"""
+Tests for the core detector: batch analysis, result cache, WhatWeb batching and the dataset cache
+"""
+
+import asyncio
+import json
+import os
+import sys
+import textwrap
+
+import pytest
+
+for module in ("aiohttp", "dotenv", "multidict", "requests"):
+    pytest.importorskip(module)
+
+import ultimate_tech_detector as utd
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return utd.UltimateTechDetector(str(tmp_path / "datasets"))
+
+
+def _write_dataset(datasets_dir, name, technologies):
+    organized = datasets_dir / "organized"
+    organized.mkdir(parents=True, exist_ok=True)
+    path = organized / name
+    path.write_text(json.dumps(technologies), encoding="utf-8")
+    return path
+
+
+def _fake_whatweb(tmp_path, body):
+    """Write an executable stand-in for the whatweb binary"""
+    script = tmp_path / "whatweb"
+    script.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body), encoding="utf-8")
+    script.chmod(0o755)
+    return str(script)
+
+
+def _whatweb(whatweb_path):
+    whatweb = utd.WhatWebIntegration.__new__(utd.WhatWebIntegration)
+    whatweb.whatweb_path = whatweb_path
+    whatweb.available = True
+    whatweb._pending = {}
+    whatweb._batch_tasks = set()
+    return whatweb
+
+
+def test_analyze_urls_keeps_input_order_and_places_errors(detector, monkeypatch):
+    delays = {"http://a.com": 0.03, "http://b.com": 0.0, "http://c.com": 0.01}
+
+    async def fake_analyze_url(url, options=None, engines=None):
+        await asyncio.sleep(delays[url])
+        if url == "http://b.com":
+            raise RuntimeError("boom")
+        return utd.AnalysisResult(url=url, final_url=url)
+
+    monkeypatch.setattr(detector, "analyze_url", fake_analyze_url)
+    results = asyncio.run(detector.analyze_urls(list(delays), engines=["pattern"], concurrency=3))
+
+    assert [getattr(result, "url", None) for result in results] == ["http://a.com", None, "http://c.com"]
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_analyze_stream_yields_results_then_raises_producer_error(detector, monkeypatch):
+    async def fake_analyze_url(url, options=None, engines=None):
+        return utd.AnalysisResult(url=url, final_url=url)
+
+    def urls():
+        yield "http://a.com"
+        yield "http://b.com"
+        raise ValueError("bad batch file")
+
+    monkeypatch.setattr(detector, "analyze_url", fake_analyze_url)
+
+    async def consume(seen):
+        async for result in detector.analyze_stream(urls(), {"workers": 2}):
+            seen.append(result.url)
+
+    seen = []
+    with pytest.raises(ValueError, match="bad batch file"):
+        asyncio.run(consume(seen))
+    assert sorted(seen) == ["http://a.com", "http://b.com"]
+
+
+def test_parse_whatweb_targets_groups_records_by_target():
+    output = "\n".join([
+        "[",
+        json.dumps({"target": "http://a.com/", "plugins": {"Apache": {"version": ["2.4"]}}}) + ",",
+        "WhatWeb report for http://a.com",
+        json.dumps({"target": "https://b.com", "plugins": {"nginx": {}, "Country": "ZZ"}}) + ",",
+        json.dumps({"target": "http://a.com/", "plugins": {"PHP": {}}}),
+        "]",
+    ])
+    targets = _whatweb("whatweb")._parse_whatweb_targets(output)
+
+    assert {target: [d.name for d in detections] for target, detections in targets.items()} == {
+        "http://a.com/": ["Apache", "PHP"],
+        "https://b.com": ["nginx"],
+    }
+    assert targets["http://a.com/"][0].versions == ["2.4"]
+
+
+def test_whatweb_batch_routes_records_to_urls_and_clears_prefetch(tmp_path):
+    whatweb_path = _fake_whatweb(tmp_path, """
+        import json, sys
+        path = next(arg for arg in sys.argv if arg.startswith("--input-file=")).split("=", 1)[1]
+        print("[", flush=True)
+        for url in open(path).read().split():
+            # A redirect hop is logged under its own target before the requested URL
+            print(json.dumps({"target": url + "/redirected", "plugins": {"Other": {}}}) + ",", flush=True)
+            print(json.dumps({"target": url + "/", "plugins": {"Apache": {}}}) + ",", flush=True)
+        print("]", flush=True)
+    """)
+    whatweb = _whatweb(whatweb_path)
+    urls = ["http://a.com", "http://b.com/"]
+
+    async def run():
+        streamed = []
+        results = await whatweb.analyze_urls(urls, on_result=lambda url, detections: streamed.append(url))
+
+        whatweb.prefetch(urls)
+        prefetched = await whatweb.analyze_url("http://b.com/")
+        await asyncio.gather(*whatweb._batch_tasks)
+        return streamed, results, prefetched
+
+    streamed, results, prefetched = asyncio.run(run())
+
+    assert streamed == urls
+    assert {url: [d.name for d in detections] for url, detections in results.items()} == {
+        "http://a.com": ["Apache"],
+        "http://b.com/": ["Apache"],
+    }
+    assert [d.name for d in prefetched] == ["Apache"]
+    assert whatweb._pending == {}
+
+
+def test_result_cache_expires_after_ttl(detector):
+    result = utd.AnalysisResult(url="http://a.com", final_url="http://a.com")
+    detector._store_cached_result("a", result)
+
+    cached = detector._get_cached_result("a", ttl=3600)
+    assert cached == result
+    assert cached is not result
+
+    assert detector._get_cached_result("a", ttl=-1) is None
+    assert "a" not in detector.result_cache
+
+
+def test_result_cache_evicts_least_recently_used(detector):
+    detector.result_cache_size = 2
+    for key in ("a", "b"):
+        detector._store_cached_result(key, utd.AnalysisResult(url=key, final_url=key))
+
+    # Reading "a" makes "b" the least recently used entry
+    assert detector._get_cached_result("a", ttl=3600) is not None
+    detector._store_cached_result("c", utd.AnalysisResult(url="c", final_url="c"))
+
+    assert list(detector.result_cache) == ["a", "c"]
+
+
+def test_dataset_cache_round_trip(tmp_path, monkeypatch):
+    datasets_dir = tmp_path / "datasets"
+    dataset_file = _write_dataset(datasets_dir, "web_servers.json", {
+        "Apache": {"category": "Web servers", "patterns": {"headers": ["Server: Apache"], "html": ["apache"]}},
+        "PHP": {"category": "Programming languages", "implies": ["Apache"], "patterns": {"headers": ["X-Powered-By: PHP"]}},
+    })
+    built = utd.UltimateDatasetManager(str(datasets_dir))
+    assert (tmp_path / utd._DATASET_CACHE_FILE).exists()
+
+    def fail(*args):
+        raise AssertionError("datasets were parsed instead of loaded from the cache")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(utd.UltimateDatasetManager, "_load_organized_datasets", fail)
+        cached = utd.UltimateDatasetManager(str(datasets_dir))
+
+    assert cached.all_technologies == built.all_technologies
+    assert cached.categories == built.categories
+    assert cached.technology_relationships == built.technology_relationships
+    assert {k: dict(v) for k, v in cached.pattern_database.items()} == {k: dict(v) for k, v in built.pattern_database.items()}
+    # The restored structures still behave like the defaultdicts they were built as
+    assert cached.pattern_database["cookies"]["missing"] == []
+    assert cached.technology_relationships["missing"] == []
+
+    # A changed dataset file invalidates the snapshot
+    dataset_file.write_text(json.dumps({"nginx": {"category": "Web servers"}}), encoding="utf-8")
+    stat = dataset_file.stat()
+    os.utime(dataset_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rebuilt = utd.UltimateDatasetManager(str(datasets_dir))
+    assert list(rebuilt.all_technologies) == ["nginx"]
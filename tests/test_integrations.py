@@ -0,0 +1,100 @@
+"""
+Tests for the WhatWeb integration's persistent daemon protocol
+"""
+
+import sys
+import textwrap
+
+import pytest
+
+from src.integrations.whatweb_integration import WhatWebBatchProcessor, WhatWebDaemon, WhatWebIntegration
+
+# What the daemon relies on: WhatWeb reads --input-file=/dev/stdin one line at a time
+# and flushes one JSON log record per target while stdin stays open
+STREAMING_WHATWEB = """
+    import json, os, sys
+    if "--version" in sys.argv:
+        print("WhatWeb version 0.5.5")
+        sys.exit(0)
+    assert "--input-file=/dev/stdin" in sys.argv
+    print("[", flush=True)
+    for line in sys.stdin:
+        url = line.strip()
+        if "://" not in url:
+            url = "http://" + url
+        # Redirect hops are logged under their own target first
+        print(json.dumps({"target": url + "/login", "plugins": {}}) + ",", flush=True)
+        print(json.dumps({"target": url + "/", "plugins": {"Apache": {}}, "pid": os.getpid()}) + ",", flush=True)
+    print("]", flush=True)
+"""
+
+# A WhatWeb that reads the whole input file before scanning never answers while stdin is open
+SLURPING_WHATWEB = """
+    import json, sys
+    if "--version" in sys.argv:
+        print("WhatWeb version 0.5.5")
+        sys.exit(0)
+    urls = sys.stdin.read().split()
+    print(json.dumps([{"target": url, "plugins": {}} for url in urls]), flush=True)
+"""
+
+
+def _whatweb(tmp_path, body, timeout=5):
+    script = tmp_path / "whatweb"
+    script.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body), encoding="utf-8")
+    script.chmod(0o755)
+    return WhatWebIntegration(whatweb_path=str(script), timeout=timeout)
+
+
+def test_daemon_answers_each_url_from_one_process(tmp_path):
+    with WhatWebDaemon(_whatweb(tmp_path, STREAMING_WHATWEB)) as daemon:
+        first, error = daemon.analyze_url("http://a.com")
+        assert error is None
+        second, error = daemon.analyze_url("b.com")
+        assert error is None
+
+    assert first["target"] == "http://a.com/"
+    assert second["target"] == "http://b.com/"
+    assert first["pid"] == second["pid"]
+    assert daemon.process is None
+
+
+def test_daemon_times_out_when_whatweb_waits_for_end_of_input(tmp_path):
+    with WhatWebDaemon(_whatweb(tmp_path, SLURPING_WHATWEB, timeout=1)) as daemon:
+        result, error = daemon.analyze_url("http://a.com")
+
+    assert result is None
+    assert "timed out" in error
+
+
+def test_batch_processor_uses_daemons_only_when_asked(tmp_path):
+    processor = WhatWebBatchProcessor(_whatweb(tmp_path, STREAMING_WHATWEB), max_workers=2)
+    urls = ["http://a.com", "http://b.com", "http://c.com"]
+
+    results = processor.process_urls(urls, use_daemons=True)
+    assert [(url, result["target"], error) for url, result, error in results] == [
+        (url, url + "/", None) for url in urls
+    ]
+
+    # The default path runs one process per URL with the URL as an argument, which this fake rejects
+    results = processor.process_urls(urls[:1])
+    assert results[0][1] is None
+    assert results[0][2] is not None
+
+
+def test_dynamic_plugin_version_none_string_keeps_version_evidence(monkeypatch):
+    pytest.importorskip("requests")
+    from types import SimpleNamespace
+    from src.integrations import dynamic_whatweb_integration as dynamic
+
+    monkeypatch.setattr(dynamic, "_detection_result_cls", lambda: SimpleNamespace)
+    integration = dynamic.DynamicWhatWebIntegration.__new__(dynamic.DynamicWhatWebIntegration)
+
+    detection = integration._extract_technology_from_plugin("Apache", {"version": "None"})
+
+    # 'None' is not a real version, but WhatWeb still reported one, so the evidence keeps its text
+    assert detection.versions == []
+    assert detection.evidence == [
+        {"field": "whatweb", "detail": "plugin_version", "match": "None", "confidence": 70, "version": "None"}
+    ]
+    assert detection.confidence == 60
@@ -4,26 +4,63 @@ Ultimate Web Technology Detection System
 """
 
 import asyncio
+import copy
+import heapq
 import json
 import logging
+import math
 import os
+import pickle
 import re
 import subprocess
 import sys
+import tempfile
 import time
 import traceback
 import requests
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Set, Tuple
+from operator import attrgetter
+from typing import Dict, List, Any, AsyncIterator, Callable, Iterable, Optional, Set, Tuple
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 import aiohttp
-from collections import defaultdict
+from collections import Counter, defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from multidict import CIMultiDict
 
-from logging_config import get_logger, log_analysis_start, log_analysis_complete, log_analysis_error, log_engine_status
+# orjson is optional; output falls back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# uvloop is optional; the CLI runs on it, without installing a global loop policy, for faster batch fetches
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# numpy is optional; large result sets are ranked with it when available
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from logging_config import configure_logging, get_logger, log_analysis_start, log_analysis_complete, log_analysis_error, log_engine_status
 logger = get_logger('ultimate_tech_detector')
 
-@dataclass
+# Parsed datasets are snapshotted next to the datasets directory; bump the version when the cached layout changes
+_DATASET_CACHE_FILE = '.detector_cache.pkl'
+_DATASET_CACHE_VERSION = 1
+_DATASET_SUBDIRS = ('organized', 'wappalyzer', 'raw')
+
+# One WhatWeb JSON record is logged per line, and verbose records can far exceed asyncio's 64 KiB line limit
+_WHATWEB_LINE_LIMIT = 16 * 1024 * 1024
+
+@dataclass(slots=True)
 class DetectionResult:
     """Single technology detection result"""
     name: str
@@ -56,7 +93,7 @@ class DetectionResult:
             'detection_time': self.detection_time
         }
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Complete analysis result for a URL"""
     url: str
@@ -68,6 +105,45 @@ class AnalysisResult:
     warnings: List[str] = field(default_factory=list)
     user_agents_tried: List[str] = field(default_factory=list)
     successful_agent: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert AnalysisResult to dictionary"""
+        return {
+            'url': self.url,
+            'final_url': self.final_url,
+            'technologies': [tech.to_dict() for tech in self.technologies],
+            'analysis_time': self.analysis_time,
+            'metadata': self.metadata,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'user_agents_tried': self.user_agents_tried,
+            'successful_agent': self.successful_agent
+        }
+
+# C-level attribute getters for the per-detection tallies and ranking
+_get_confidence = attrgetter('confidence')
+_get_source = attrgetter('source')
+_get_category_and_confidence = attrgetter('category', 'confidence')
+
+DEFAULT_ENGINES = ('pattern', 'whatweb', 'cmseek', 'whatcms', 'wappalyzer', 'additional', 'deep')
+
+@dataclass(frozen=True, slots=True)
+class AnalyzeOptions:
+    """Options that change an analysis result; hashable so it can key the result cache"""
+    engines: Tuple[str, ...] = DEFAULT_ENGINES
+    min_confidence: int = 0
+    max_results: int = 200
+    include_summary: bool = True
+    
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], engines: Optional[List[str]] = None) -> 'AnalyzeOptions':
+        """Build from an options dict and engine list"""
+        return cls(
+            engines=tuple(engines) if engines is not None else DEFAULT_ENGINES,
+            min_confidence=options.get('min_confidence', 0),
+            max_results=options.get('max_results', 200),
+            include_summary=options.get('include_summary', True)
+        )
 
 class UltimateDatasetManager:
     """Unified dataset manager for maximum technology coverage"""
@@ -82,6 +158,11 @@ class UltimateDatasetManager:
     
     def _load_all_datasets(self):
         """Load all available datasets for maximum coverage"""
+        signature = self._dataset_signature()
+        if self._load_cached_datasets(signature):
+            logger.info("Loaded %s technologies from dataset cache", len(self.all_technologies))
+            return
+        
         logger.info("Loading all available datasets for 100% utilization...")
         
         # Load organized datasets
@@ -105,8 +186,72 @@ class UltimateDatasetManager:
         # Build technology relationships
         self._build_technology_relationships()
         
-        logger.info(f"Loaded {len(self.all_technologies)} technologies from all datasets")
-        logger.info(f"Built pattern database with {sum(len(patterns) for patterns in self.pattern_database.values())} patterns")
+        logger.info("Loaded %s technologies from all datasets", len(self.all_technologies))
+        logger.info("Built pattern database with %s patterns", sum(len(patterns) for patterns in self.pattern_database.values()))
+        self._save_cached_datasets(signature)
+    
+    def _cache_path(self) -> str:
+        """Location of the pickled dataset snapshot"""
+        return os.path.join(os.path.dirname(os.path.normpath(self.datasets_dir)), _DATASET_CACHE_FILE)
+    
+    def _dataset_signature(self) -> Tuple:
+        """Name, size and mtime of every dataset file; a cached snapshot is only valid for an identical signature"""
+        signature = [_DATASET_CACHE_VERSION, os.path.abspath(self.datasets_dir)]
+        for subdir in _DATASET_SUBDIRS:
+            try:
+                entries = sorted(os.scandir(os.path.join(self.datasets_dir, subdir)), key=attrgetter('name'))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    signature.append((subdir, entry.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+    
+    def _load_cached_datasets(self, signature: Tuple) -> bool:
+        """Restore the parsed datasets from the snapshot if it matches the dataset files"""
+        cache_path = self._cache_path()
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Ignoring unreadable dataset cache %s: %s", cache_path, e)
+            return False
+        
+        if not isinstance(cached, dict) or cached.get('signature') != signature:
+            return False
+        
+        self.all_technologies = cached['all_technologies']
+        for pattern_type, patterns in cached['pattern_database'].items():
+            self.pattern_database[pattern_type].update(patterns)
+        self.technology_relationships.update(cached['technology_relationships'])
+        self.categories.update(cached['categories'])
+        return True
+    
+    def _save_cached_datasets(self, signature: Tuple):
+        """Snapshot the parsed datasets so the next start skips JSON parsing"""
+        cache_path = self._cache_path()
+        snapshot = {
+            'signature': signature,
+            'all_technologies': self.all_technologies,
+            # Nested defaultdicts hold a lambda factory, which cannot be pickled
+            'pattern_database': {pattern_type: dict(patterns) for pattern_type, patterns in self.pattern_database.items()},
+            'technology_relationships': dict(self.technology_relationships),
+            'categories': dict(self.categories),
+        }
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=5)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.debug("Could not write dataset cache %s: %s", cache_path, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
     
     def _load_organized_datasets(self, organized_path: str):
         """Load organized category datasets"""
@@ -123,7 +268,7 @@ class UltimateDatasetManager:
                                     category = tech_data.get('category', 'Unknown')
                                     self.categories[category] += 1
                 except Exception as e:
-                    logger.warning(f"Failed to load {filename}: {e}")
+                    logger.warning("Failed to load %s: %s", filename, e)
     
     def _load_wappalyzer_datasets(self, wappalyzer_path: str):
         """Load individual Wappalyzer files"""
@@ -140,7 +285,7 @@ class UltimateDatasetManager:
                                     category = tech_data.get('category', 'Unknown')
                                     self.categories[category] += 1
                 except Exception as e:
-                    logger.warning(f"Failed to load {filename}: {e}")
+                    logger.warning("Failed to load %s: %s", filename, e)
     
     def _load_raw_datasets(self, raw_path: str):
         """Load raw datasets (only add new technologies, don't overwrite existing ones)"""
@@ -159,7 +304,7 @@ class UltimateDatasetManager:
                                         category = tech_data.get('category', 'Unknown')
                                         self.categories[category] += 1
                 except Exception as e:
-                    logger.warning(f"Failed to load {filename}: {e}")
+                    logger.warning("Failed to load %s: %s", filename, e)
     
     def _build_pattern_database(self):
         """Build comprehensive pattern database for fast matching"""
@@ -314,6 +459,8 @@ class UltimatePatternMatcher:
     def __init__(self, dataset_manager: UltimateDatasetManager):
         self.dataset_manager = dataset_manager
         self.pattern_cache = {}
+        self._lowered_source = None
+        self._lowered_text = ''
         self.detection_stats = {
             'total_detections': 0,
             'pattern_matches': 0,
@@ -323,24 +470,24 @@ class UltimatePatternMatcher:
     
     async def detect_all_technologies(self, url: str, response_data: Dict[str, Any]) -> List[DetectionResult]:
         """Detect all possible technologies using comprehensive pattern matching"""
-        logger.info(f"Starting comprehensive technology detection for {url}")
-        start_time = time.time()
+        logger.info("Starting comprehensive technology detection for %s", url)
+        start_time = time.perf_counter()
         
         all_detections = []
         
         # Level 1: Fast pattern detection (headers, meta, basic patterns)
         fast_results = await self._detect_fast_patterns(url, response_data)
-        logger.info(f"Fast pattern detection: {len(fast_results)} technologies found")
+        logger.info("Fast pattern detection: %s technologies found", len(fast_results))
         all_detections.extend(fast_results)
         
         # Level 2: Medium pattern detection (HTML, scripts, URLs)
         medium_results = await self._detect_medium_patterns(url, response_data)
-        logger.info(f"Medium pattern detection: {len(medium_results)} technologies found")
+        logger.info("Medium pattern detection: %s technologies found", len(medium_results))
         all_detections.extend(medium_results)
         
         # Level 3: Deep pattern detection (DNS, SSL, complex patterns)
         deep_results = await self._detect_deep_patterns(url, response_data)
-        logger.info(f"Deep pattern detection: {len(deep_results)} technologies found")
+        logger.info("Deep pattern detection: %s technologies found", len(deep_results))
         all_detections.extend(deep_results)
         
         # Cross-validation and relationship detection
@@ -350,98 +497,126 @@ class UltimatePatternMatcher:
         # Deduplicate and merge results
         final_detections = self._deduplicate_detections(all_detections)
         
-        detection_time = time.time() - start_time
-        logger.info(f"Comprehensive detection completed in {detection_time:.2f}s - {len(final_detections)} technologies found")
+        detection_time = time.perf_counter() - start_time
+        logger.info("Comprehensive detection completed in %.2fs - %s technologies found", detection_time, len(final_detections))
         
         return final_detections
     
+    def _compile_pattern(self, pattern: str, flags: int = re.IGNORECASE):
+        """Compile a dataset pattern once into a matcher (invalid patterns are cached as None)"""
+        key = (pattern, flags)
+        if key not in self.pattern_cache:
+            self.pattern_cache[key] = self._build_matcher(pattern, flags)
+        return self.pattern_cache[key]
+    
+    def _build_matcher(self, pattern: str, flags: int):
+        """Specialize plain literal patterns to string operations, fall back to re otherwise"""
+        anchored_start = pattern.startswith('^')
+        anchored_end = pattern.endswith('$')
+        literal = pattern[1 if anchored_start else 0:-1 if anchored_end else None]
+        anchored = anchored_start or anchored_end
+        
+        if (literal and literal.isascii() and re.escape(literal) == literal
+                and not (anchored and flags & re.MULTILINE)):
+            ignore_case = bool(flags & re.IGNORECASE)
+            needle = literal.lower() if ignore_case else literal
+            prepare = self._lowered if ignore_case else str
+            
+            # "$" also matches just before a trailing newline
+            if anchored_start and anchored_end:
+                return lambda text: prepare(text) in (needle, needle + '\n')
+            if anchored_start:
+                return lambda text: prepare(text).startswith(needle)
+            if anchored_end:
+                return lambda text: prepare(text).endswith((needle, needle + '\n'))
+            return lambda text: needle in prepare(text)
+        
+        try:
+            regex = re.compile(pattern, flags)
+        except re.error:
+            return None
+        return lambda text: regex.search(text) is not None
+    
+    def _lowered(self, text: str) -> str:
+        """Lowercase text, reusing the last result while the same text is scanned"""
+        if text is not self._lowered_source:
+            self._lowered_source = text
+            self._lowered_text = text.lower()
+        return self._lowered_text
+    
+    def search(self, pattern: str, text: str, flags: int = re.IGNORECASE) -> bool:
+        """Check a dataset pattern against text using the cached matcher"""
+        matcher = self._compile_pattern(pattern, flags)
+        return matcher is not None and matcher(text)
+    
     async def _detect_fast_patterns(self, url: str, response_data: Dict[str, Any]) -> List[DetectionResult]:
         """Fast pattern detection for headers and meta tags"""
         detections = []
+        detected_at = time.time()
         
-        # Headers detection
-        headers = response_data.get('headers', {})
-        logger.info(f"Fast pattern detection: Checking {len(headers)} headers")
-        for header, value in headers.items():
-            header_text = f"{header}: {value}"
-            # Check all header patterns
-            if 'headers' in self.dataset_manager.pattern_database:
-                for pattern in self.dataset_manager.pattern_database['headers']:
-                    try:
-                        if re.search(pattern, header_text, re.IGNORECASE):
-                            for match in self.dataset_manager.pattern_database['headers'][pattern]:
-                                tech_name = match['technology']
-                                tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
-                                
-                                detection = DetectionResult(
-                                    name=tech_name,
-                                    confidence=match['confidence'],
-                                    category=tech_data.get('category', 'Unknown'),
-                                    evidence=[{
-                                        'field': 'headers',
-                                        'detail': header_text,
-                                        'match': pattern,
-                                        'confidence': match['confidence']
-                                    }],
-                                    source='fast_pattern',
-                                    website=tech_data.get('website'),
-                                    description=tech_data.get('description'),
-                                    saas=tech_data.get('saas'),
-                                    oss=tech_data.get('oss'),
-                                    detection_time=time.time()
-                                )
-                                detections.append(detection)
-                                logger.info(f"Fast pattern detected: {tech_name} from header")
-                    except re.error:
-                        continue
-        
-        # Meta tags detection
-        meta_tags = response_data.get('meta_tags', {})
-        logger.info(f"Fast pattern detection: Checking {len(meta_tags)} meta tags")
-        for meta, value in meta_tags.items():
-            meta_text = f"{meta}: {value}"
-            # Check all meta patterns
-            if 'meta' in self.dataset_manager.pattern_database:
-                for pattern in self.dataset_manager.pattern_database['meta']:
-                    try:
-                        if re.search(pattern, meta_text, re.IGNORECASE):
-                            for match in self.dataset_manager.pattern_database['meta'][pattern]:
-                                tech_name = match['technology']
-                                tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
-                                
-                                detection = DetectionResult(
-                                    name=tech_name,
-                                    confidence=match['confidence'],
-                                    category=tech_data.get('category', 'Unknown'),
-                                    evidence=[{
-                                        'field': 'meta',
-                                        'detail': meta_text,
-                                        'match': pattern,
-                                        'confidence': match['confidence']
-                                    }],
-                                    source='fast_pattern',
-                                    website=tech_data.get('website'),
-                                    description=tech_data.get('description'),
-                                    saas=tech_data.get('saas'),
-                                    oss=tech_data.get('oss'),
-                                    detection_time=time.time()
-                                )
-                                detections.append(detection)
-                                logger.info(f"Fast pattern detected: {tech_name} from meta tag")
-                    except re.error:
-                        continue
+        # Headers and meta tags share one "name: value" line buffer built at fetch time,
+        # so each pattern is scanned once over the buffer and only confirmed per line on a hit
+        kv_lines = response_data.get('kv_lines', [])
+        kv_buffer = '\n'.join(line for _, line in kv_lines)
+        logger.info("Fast pattern detection: Checking %s headers and %s meta tags",
+                    len(response_data.get('headers', {})), len(response_data.get('meta_tags', {})))
+        
+        for field, label in (('headers', 'header'), ('meta', 'meta tag')):
+            if field not in self.dataset_manager.pattern_database:
+                continue
+            lines = [line for line_field, line in kv_lines if line_field == field]
+            if not lines:
+                continue
+            
+            # Collect (line index, pattern) hits, then emit in line order like the per-line scan did
+            hits = []
+            for pattern in self.dataset_manager.pattern_database[field]:
+                if not self.search(pattern, kv_buffer, re.IGNORECASE | re.MULTILINE):
+                    continue
+                line_matcher = self._compile_pattern(pattern)
+                for index, text in enumerate(lines):
+                    if line_matcher(text):
+                        hits.append((index, pattern))
+            hits.sort(key=lambda hit: hit[0])
+            
+            for index, pattern in hits:
+                text = lines[index]
+                for match in self.dataset_manager.pattern_database[field][pattern]:
+                    tech_name = match['technology']
+                    tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
+                    
+                    detection = DetectionResult(
+                        name=tech_name,
+                        confidence=match['confidence'],
+                        category=tech_data.get('category', 'Unknown'),
+                        evidence=[{
+                            'field': field,
+                            'detail': text,
+                            'match': pattern,
+                            'confidence': match['confidence']
+                        }],
+                        source='fast_pattern',
+                        website=tech_data.get('website'),
+                        description=tech_data.get('description'),
+                        saas=tech_data.get('saas'),
+                        oss=tech_data.get('oss'),
+                        detection_time=detected_at
+                    )
+                    detections.append(detection)
+                    logger.info("Fast pattern detected: %s from %s", tech_name, label)
         
         return detections
     
     async def _detect_medium_patterns(self, url: str, response_data: Dict[str, Any]) -> List[DetectionResult]:
         """Medium pattern detection for HTML, scripts, and URLs"""
+        detected_at = time.time()
         detections = []
         
         # HTML content detection
         html_content = response_data.get('content', '')
         for pattern in self.dataset_manager.pattern_database['html']:
             try:
-                if re.search(pattern, html_content, re.IGNORECASE):
+                if self.search(pattern, html_content, re.IGNORECASE):
                     for match in self.dataset_manager.pattern_database['html'][pattern]:
                         tech_name = match['technology']
                         tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -461,7 +636,7 @@ class UltimatePatternMatcher:
                             description=tech_data.get('description'),
                             saas=tech_data.get('saas'),
                             oss=tech_data.get('oss'),
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         detections.append(detection)
             except re.error:
@@ -473,7 +648,7 @@ class UltimatePatternMatcher:
         for script_url in scripts:
             for pattern in self.dataset_manager.pattern_database['scripts']:
                 try:
-                    if re.search(pattern, script_url, re.IGNORECASE):
+                    if self.search(pattern, script_url, re.IGNORECASE):
                         for match in self.dataset_manager.pattern_database['scripts'][pattern]:
                             tech_name = match['technology']
                             tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -493,7 +668,7 @@ class UltimatePatternMatcher:
                                 description=tech_data.get('description'),
                                 saas=tech_data.get('saas'),
                                 oss=tech_data.get('oss'),
-                                detection_time=time.time()
+                                detection_time=detected_at
                             )
                             detections.append(detection)
                 except re.error:
@@ -505,6 +680,7 @@ class UltimatePatternMatcher:
     async def _detect_deep_patterns(self, url: str, response_data: Dict[str, Any]) -> List[DetectionResult]:
         """Deep pattern detection for complex patterns and relationships"""
         detections = []
+        detected_at = time.time()
         
         # URL pattern detection
         parsed_url = urlparse(url)
@@ -512,7 +688,7 @@ class UltimatePatternMatcher:
         
         for pattern in self.dataset_manager.pattern_database['urls']:
             try:
-                if re.search(pattern, url, re.IGNORECASE):
+                if self.search(pattern, url, re.IGNORECASE):
                     for match in self.dataset_manager.pattern_database['urls'][pattern]:
                         tech_name = match['technology']
                         tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -532,7 +708,7 @@ class UltimatePatternMatcher:
                             description=tech_data.get('description'),
                             saas=tech_data.get('saas'),
                             oss=tech_data.get('oss'),
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         detections.append(detection)
             except re.error:
@@ -544,6 +720,7 @@ class UltimatePatternMatcher:
     async def _cross_validate_detections(self, detections: List[DetectionResult]) -> List[DetectionResult]:
         """Cross-validate detections using technology relationships"""
         cross_validated = []
+        detected_at = time.time()
         
         for detection in detections:
             tech_name = detection.name
@@ -568,7 +745,7 @@ class UltimatePatternMatcher:
                             description=tech_data.get('description'),
                             saas=tech_data.get('saas'),
                             oss=tech_data.get('oss'),
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         cross_validated.append(cross_detection)
         
@@ -598,6 +775,8 @@ class WhatWebIntegration:
     def __init__(self):
         self.whatweb_path = "/usr/bin/whatweb"
         self.available = self._check_availability()
+        self._pending = {}
+        self._batch_tasks = set()
     
     def _check_availability(self) -> bool:
         """Check if WhatWeb is available"""
@@ -608,11 +787,118 @@ class WhatWebIntegration:
         except:
             return False
     
+    def prefetch(self, urls: List[str], max_threads: int = 25):
+        """Start one WhatWeb process for several URLs; analyze_url picks up each result as soon as it is logged"""
+        if not self.available:
+            return
+        urls = [url for url in dict.fromkeys(urls) if url not in self._pending]
+        if not urls:
+            return
+        
+        loop = asyncio.get_running_loop()
+        futures = {url: loop.create_future() for url in urls}
+        self._pending.update(futures)
+        
+        def resolve(url: str, detections: List[DetectionResult]):
+            future = futures[url]
+            if not future.done():
+                future.set_result(detections)
+        
+        async def run_batch():
+            try:
+                await self.analyze_urls(urls, max_threads, on_result=resolve)
+            finally:
+                # URLs the batch did not report fall back to a single run, and no future outlives its batch
+                for url, future in futures.items():
+                    if not future.done():
+                        future.set_result(None)
+                    if self._pending.get(url) is future:
+                        del self._pending[url]
+        
+        task = asyncio.ensure_future(run_batch())
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def analyze_urls(self, urls: List[str], max_threads: int = 25,
+                           on_result: Optional[Callable[[str, List[DetectionResult]], None]] = None) -> Dict[str, List[DetectionResult]]:
+        """Run a single WhatWeb process over several URLs and group detections by URL
+        
+        on_result(url, detections) is called as soon as each URL's record has been read.
+        """
+        if not self.available or not urls:
+            return {}
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as input_file:
+            input_file.write('\n'.join(urls) + '\n')
+        
+        # Targets are matched back to the requested URLs; redirect hops logged under other targets are skipped
+        lookup = {url.rstrip('/'): url for url in urls}
+        results = {}
+        process = None
+        stderr_task = None
+        timeout = 120 * math.ceil(len(urls) / max_threads)
+        try:
+            cmd = [
+                self.whatweb_path,
+                f"--input-file={input_file.name}",
+                "--log-json=-",
+                "--verbose",
+                "--aggression=3",
+                f"--max-threads={max_threads}"
+            ]
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_WHATWEB_LINE_LIMIT
+            )
+            stderr_task = asyncio.ensure_future(process.stderr.read())
+            
+            async def read_records():
+                async for line in process.stdout:
+                    for target, detections in self._parse_whatweb_line(line.decode('utf-8', 'replace')):
+                        url = lookup.get(target.rstrip('/'))
+                        if url is None:
+                            continue
+                        results.setdefault(url, []).extend(detections)
+                        if on_result is not None:
+                            on_result(url, detections)
+                await process.wait()
+            
+            await asyncio.wait_for(read_records(), timeout=timeout)
+            stderr = await stderr_task
+            if process.returncode != 0:
+                logger.warning("WhatWeb batch failed (exit code %s): %s", process.returncode, stderr.decode('utf-8', 'replace'))
+            logger.info("WhatWeb batch analyzed %s of %s URLs", len(results), len(urls))
+            return results
+        
+        except asyncio.TimeoutError:
+            logger.error("WhatWeb batch timed out after %s seconds with %s of %s URLs analyzed", timeout, len(results), len(urls))
+            return results
+        except Exception as e:
+            logger.error("WhatWeb batch analysis failed: %s", e)
+            return results
+        finally:
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+            if stderr_task is not None and not stderr_task.done():
+                stderr_task.cancel()
+            os.unlink(input_file.name)
+    
     async def analyze_url(self, url: str) -> List[DetectionResult]:
         """Run WhatWeb analysis on URL"""
         if not self.available:
             return []
         
+        # Use the result of a batch run when this URL was prefetched; fall back to a single run
+        future = self._pending.pop(url, None)
+        if future is not None:
+            detections = await future
+            if detections is not None:
+                logger.info("WhatWeb detected %s technologies", len(detections))
+                return detections
+        
         try:
             cmd = [
                 self.whatweb_path,
@@ -622,7 +908,7 @@ class WhatWebIntegration:
                 url
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+            result = await asyncio.to_thread(subprocess.run, cmd, capture_output=True, text=True, timeout=120)
             
             if result.returncode == 0:
                 if result.stdout and result.stdout.strip():
@@ -631,11 +917,11 @@ class WhatWebIntegration:
                     logger.info("WhatWeb completed but returned no output")
                     return []
             else:
-                logger.warning(f"WhatWeb failed (exit code {result.returncode}): {result.stderr}")
+                logger.warning("WhatWeb failed (exit code %s): %s", result.returncode, result.stderr)
                 return []
                 
         except Exception as e:
-            logger.error(f"WhatWeb analysis failed: {e}")
+            logger.error("WhatWeb analysis failed: %s", e)
             return []
     
     def _parse_whatweb_output(self, output: str) -> List[DetectionResult]:
@@ -645,7 +931,7 @@ class WhatWebIntegration:
         try:
             # Clean the output and handle multiple JSON objects
             lines = output.strip().split('\n')
-            logger.debug(f"WhatWeb output lines: {len(lines)}")
+            logger.debug("WhatWeb output lines: %s", len(lines))
             
             for i, line in enumerate(lines):
                 if not line.strip():
@@ -689,20 +975,52 @@ class WhatWebIntegration:
                                             detections.append(detection)
                                             
                 except json.JSONDecodeError as je:
-                    logger.warning(f"JSON decode error on line {i+1}: {je}")
-                    logger.debug(f"Problematic line: {line[:100]}...")
+                    logger.warning("JSON decode error on line %s: %s", i+1, je)
+                    logger.debug("Problematic line: %s...", line[:100])
                     continue
                 except Exception as e:
-                    logger.warning(f"Error processing line {i+1}: {e}")
+                    logger.warning("Error processing line %s: %s", i+1, e)
                     continue
                     
         except Exception as e:
-            logger.error(f"Failed to parse WhatWeb output: {e}")
-            logger.debug(f"Raw output: {output[:500]}...")
+            logger.error("Failed to parse WhatWeb output: %s", e)
+            logger.debug("Raw output: %s...", output[:500])
         
-        logger.info(f"WhatWeb detected {len(detections)} technologies")
+        logger.info("WhatWeb detected %s technologies", len(detections))
         return detections
     
+    def _parse_whatweb_targets(self, output: str) -> Dict[str, List[DetectionResult]]:
+        """Parse WhatWeb JSON output from a multi-target run, grouped by target"""
+        targets = {}
+        for line in output.splitlines():
+            for target, detections in self._parse_whatweb_line(line):
+                targets.setdefault(target, []).extend(detections)
+        return targets
+    
+    def _parse_whatweb_line(self, line: str) -> List[Tuple[str, List[DetectionResult]]]:
+        """Parse one line of WhatWeb JSON log output into (target, detections) pairs"""
+        line = line.strip().rstrip(',')
+        if not line or line in ('[', ']'):
+            return []
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            logger.debug("Skipping non-JSON WhatWeb line: %s...", line[:100])
+            return []
+        
+        records = []
+        for entry in (data if isinstance(data, list) else [data]):
+            if not isinstance(entry, dict) or 'target' not in entry or 'plugins' not in entry:
+                continue
+            detections = []
+            for plugin_name, plugin_data in entry['plugins'].items():
+                if isinstance(plugin_data, dict):
+                    detection = self._create_whatweb_detection(plugin_name, plugin_data)
+                    if detection:
+                        detections.append(detection)
+            records.append((entry['target'], detections))
+        return records
+    
     def _create_whatweb_detection(self, plugin_name: str, plugin_data: dict) -> DetectionResult:
         """Create DetectionResult from WhatWeb plugin data"""
         try:
@@ -747,7 +1065,7 @@ class WhatWebIntegration:
                 detection_time=time.time()
             )
         except Exception as e:
-            logger.warning(f"Failed to create detection for {plugin_name}: {e}")
+            logger.warning("Failed to create detection for %s: %s", plugin_name, e)
             return None
 
 class CMSeeKIntegration:
@@ -768,7 +1086,7 @@ class CMSeeKIntegration:
                    "1.1.3" in result.stdout or
                    "K-RONA" in result.stdout)
         except Exception as e:
-            logger.warning(f"CMSeeK availability check failed: {e}")
+            logger.warning("CMSeeK availability check failed: %s", e)
             return False
     
     async def analyze_url(self, url: str) -> List[DetectionResult]:
@@ -785,7 +1103,7 @@ class CMSeeKIntegration:
                 "--batch"  # Non-interactive mode
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = await asyncio.to_thread(subprocess.run, cmd, capture_output=True, text=True, timeout=60)
             
             if result.returncode == 0:
                 if result.stdout and result.stdout.strip():
@@ -794,28 +1112,29 @@ class CMSeeKIntegration:
                     logger.info("CMSeeK completed but returned no output")
                     return []
             else:
-                logger.warning(f"CMSeeK failed (exit code {result.returncode}): {result.stderr}")
+                logger.warning("CMSeeK failed (exit code %s): %s", result.returncode, result.stderr)
                 return []
                 
         except Exception as e:
-            logger.error(f"CMSeeK analysis failed: {e}")
+            logger.error("CMSeeK analysis failed: %s", e)
             return []
     
     def _parse_cmseek_output(self, output: str, url: str) -> List[DetectionResult]:
         """Parse CMSeeK output and extract CMS information"""
+        detected_at = time.time()
         detections = []
         
         try:
             # Look for CMS detection patterns in the output
             lines = output.strip().split('\n')
-            logger.debug(f"CMSeeK output lines: {len(lines)}")
+            logger.debug("CMSeeK output lines: %s", len(lines))
             
             current_cms = None
             current_version = None
             
             for line in lines:
                 line = line.strip()
-                logger.debug(f"CMSeeK line: {line}")
+                logger.debug("CMSeeK line: %s", line)
                 
                 # Look for CMS detection patterns
                 if ('CMS Detected' in line or 'CMS:' in line or 'Detected:' in line or 
@@ -838,10 +1157,10 @@ class CMSeeKIntegration:
                             source='cmseek',
                             website=cms_info.get('website', ''),
                             description=cms_info.get('description', ''),
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         detections.append(detection)
-                        logger.info(f"CMSeeK detected CMS: {cms_info['name']}")
+                        logger.info("CMSeeK detected CMS: %s", cms_info['name'])
                     else:
                         # If we can't identify the specific CMS, create a generic detection
                         detection = DetectionResult(
@@ -858,7 +1177,7 @@ class CMSeeKIntegration:
                             source='cmseek',
                             website='',
                             description='Content management system detected by CMSeeK',
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         detections.append(detection)
                         logger.info("CMSeeK detected unknown CMS")
@@ -877,7 +1196,7 @@ class CMSeeKIntegration:
                                 'match': version_info[0],
                                 'confidence': 85
                             })
-                            logger.info(f"CMSeeK detected version: {version_info[0]} for {current_cms['name']}")
+                            logger.info("CMSeeK detected version: %s for %s", version_info[0], current_cms['name'])
                         else:
                             # Create a new detection if we have version but no CMS
                             detection = DetectionResult(
@@ -894,16 +1213,16 @@ class CMSeeKIntegration:
                                 source='cmseek',
                                 website=current_cms.get('website', '') if current_cms else '',
                                 description=current_cms.get('description', '') if current_cms else '',
-                                detection_time=time.time()
+                                detection_time=detected_at
                             )
                             detections.append(detection)
-                            logger.info(f"CMSeeK detected version: {version_info[0]}")
+                            logger.info("CMSeeK detected version: %s", version_info[0])
             
-            logger.info(f"CMSeeK detected {len(detections)} CMS technologies")
+            logger.info("CMSeeK detected %s CMS technologies", len(detections))
             
         except Exception as e:
-            logger.error(f"Failed to parse CMSeeK output: {e}")
-            logger.debug(f"Raw CMSeeK output: {output[:500]}...")
+            logger.error("Failed to parse CMSeeK output: %s", e)
+            logger.debug("Raw CMSeeK output: %s...", output[:500])
         
         return detections
     
@@ -1094,7 +1413,7 @@ class CMSeeKIntegration:
                     }
             
         except Exception as e:
-            logger.warning(f"Failed to extract CMS info from line: {line} - {e}")
+            logger.warning("Failed to extract CMS info from line: %s - %s", line, e)
         
         return None
     
@@ -1115,7 +1434,7 @@ class CMSeeKIntegration:
                     return [match.group(1).strip()]
             
         except Exception as e:
-            logger.warning(f"Failed to extract version info from line: {line} - {e}")
+            logger.warning("Failed to extract version info from line: %s - %s", line, e)
         
         return []
 
@@ -1144,7 +1463,7 @@ class WhatCMSIntegration:
             )
             return response.status_code == 200
         except Exception as e:
-            logger.warning(f"WhatCMS.org API not available: {e}")
+            logger.warning("WhatCMS.org API not available: %s", e)
             return False
     
     async def analyze_url(self, url: str) -> List[DetectionResult]:
@@ -1158,25 +1477,27 @@ class WhatCMSIntegration:
             clean_url = url.replace('https://', '').replace('http://', '')
             
             # Make API request
-            response = requests.get(
+            response = await asyncio.to_thread(
+                requests.get,
                 self.api_url,
                 params={'key': self.api_key, 'url': clean_url},
                 timeout=30
             )
             
             if response.status_code != 200:
-                logger.warning(f"WhatCMS.org API request failed: {response.status_code}")
+                logger.warning("WhatCMS.org API request failed: %s", response.status_code)
                 return []
             
             data = response.json()
             
             if data.get('result', {}).get('code') != 200:
-                logger.warning(f"WhatCMS.org API error: {data.get('result', {}).get('msg', 'Unknown error')}")
+                logger.warning("WhatCMS.org API error: %s", data.get('result', {}).get('msg', 'Unknown error'))
                 return []
             
             detections = []
             results = data.get('results', [])
             
+            detected_at = time.time()
             for tech in results:
                 # Extract technology information
                 name = tech.get('name', 'Unknown')
@@ -1213,16 +1534,16 @@ class WhatCMSIntegration:
                     source='whatcms',
                     website=f"https://whatcms.org{tech_url}" if tech_url else '',
                     description=f"Detected by WhatCMS.org API (ID: {tech_id})",
-                    detection_time=time.time()
+                    detection_time=detected_at
                 )
                 detections.append(detection)
-                logger.info(f"WhatCMS.org detected: {name} ({primary_category})")
+                logger.info("WhatCMS.org detected: %s (%s)", name, primary_category)
             
-            logger.info(f"WhatCMS.org detected {len(detections)} technologies")
+            logger.info("WhatCMS.org detected %s technologies", len(detections))
             return detections
             
         except Exception as e:
-            logger.error(f"WhatCMS.org analysis failed: {e}")
+            logger.error("WhatCMS.org analysis failed: %s", e)
             return []
 
 class WappalyzerIntegration:
@@ -1239,7 +1560,7 @@ class WappalyzerIntegration:
                                   capture_output=True, text=True, timeout=15)
             return result.returncode == 0
         except Exception as e:
-            logger.warning(f"Wappalyzer not available: {e}")
+            logger.warning("Wappalyzer not available: %s", e)
             return False
     
     async def analyze_url(self, url: str) -> List[DetectionResult]:
@@ -1250,7 +1571,8 @@ class WappalyzerIntegration:
         
         try:
             # Run wappalyzer command
-            result = subprocess.run(
+            result = await asyncio.to_thread(
+                subprocess.run,
                 ['wappalyzer', url, '--json'],
                 capture_output=True,
                 text=True,
@@ -1258,7 +1580,7 @@ class WappalyzerIntegration:
             )
             
             if result.returncode != 0:
-                logger.warning(f"Wappalyzer analysis failed: {result.stderr}")
+                logger.warning("Wappalyzer analysis failed: %s", result.stderr)
                 return []
             
             # Parse JSON output
@@ -1266,6 +1588,7 @@ class WappalyzerIntegration:
             detections = []
             
             technologies = data.get('technologies', [])
+            detected_at = time.time()
             for tech in technologies:
                 name = tech.get('name', 'Unknown')
                 confidence = tech.get('confidence', 0)
@@ -1289,23 +1612,25 @@ class WappalyzerIntegration:
                     source='wappalyzer',
                     website=website,
                     description=description,
-                    detection_time=time.time()
+                    detection_time=detected_at
                 )
                 detections.append(detection)
-                logger.info(f"Wappalyzer detected: {name} ({category})")
+                logger.info("Wappalyzer detected: %s (%s)", name, category)
             
-            logger.info(f"Wappalyzer detected {len(detections)} technologies")
+            logger.info("Wappalyzer detected %s technologies", len(detections))
             return detections
             
         except Exception as e:
-            logger.error(f"Wappalyzer analysis failed: {e}")
+            logger.error("Wappalyzer analysis failed: %s", e)
             return []
 
 class UltimateTechDetector:
     """Ultimate unified technology detection system"""
     
-    def __init__(self, datasets_dir: str = "data/datasets"):
+    def __init__(self, datasets_dir: str = "data/datasets", connector: Optional[aiohttp.BaseConnector] = None):
         self.datasets_dir = datasets_dir
+        # A connector passed in is shared with the caller, who closes it; otherwise each session owns its own
+        self.connector = connector
         self.dataset_manager = UltimateDatasetManager(datasets_dir)
         self.pattern_matcher = UltimatePatternMatcher(self.dataset_manager)
         self.whatweb = WhatWebIntegration()
@@ -1313,6 +1638,8 @@ class UltimateTechDetector:
         self.whatcms = WhatCMSIntegration()
         self.wappalyzer = WappalyzerIntegration()
         self.session = None
+        self.result_cache = OrderedDict()
+        self.result_cache_size = 1024
     
     async def close(self):
         """Close the HTTP session"""
@@ -1325,11 +1652,24 @@ class UltimateTechDetector:
         if options is None:
             options = {}
         if engines is None:
-            engines = ['pattern', 'whatweb', 'cmseek', 'whatcms', 'wappalyzer', 'additional', 'deep']
+            engines = list(DEFAULT_ENGINES)
+        
+        # Serve repeated URLs from the result cache when enabled
+        cache_key = None
+        if options.get('cache'):
+            # Callers analyzing many URLs pass a prebuilt AnalyzeOptions so the key is not rebuilt per URL
+            analyze_options = options.get('analyze_options')
+            if analyze_options is None or analyze_options.engines != tuple(engines):
+                analyze_options = AnalyzeOptions.from_options(options, engines)
+            cache_key = (url, analyze_options)
+            cached = self._get_cached_result(cache_key, options.get('cache_ttl', 3600))
+            if cached is not None:
+                logger.info("CACHE_HIT: %s", url)
+                return cached
         
-        start_time = time.time()
-        logger.info(f"ANALYSIS_START: {url} with engines: {engines}")
-        logger.debug(f"ANALYSIS_OPTIONS: {options}")
+        start_time = time.perf_counter()
+        logger.info("ANALYSIS_START: %s with engines: %s", url, engines)
+        logger.debug("ANALYSIS_OPTIONS: %s", options)
         
         # Log analysis start
         log_analysis_start(url, engines)
@@ -1339,11 +1679,25 @@ class UltimateTechDetector:
             logger.debug("Initializing new aiohttp session")
             self.session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=options.get('timeout', 60)),
-                headers={'User-Agent': 'UltimateTechDetector/1.0'}
+                headers={'User-Agent': 'UltimateTechDetector/1.0'},
+                connector=self.connector,
+                connector_owner=self.connector is None
             )
         else:
             logger.debug("Reusing existing aiohttp session")
         
+        # External engines only need the URL, so they run concurrently with the page fetch
+        external_engines = [
+            ('whatweb', 'WhatWeb', self.whatweb),
+            ('cmseek', 'CMSeeK', self.cmseek),
+            ('whatcms', 'WhatCMS.org', self.whatcms),
+            ('wappalyzer', 'Wappalyzer', self.wappalyzer)
+        ]
+        external_tasks = [
+            asyncio.ensure_future(self._run_engine(name, engine.analyze_url(url)))
+            for key, name, engine in external_engines if key in engines
+        ]
+        
         try:
             # Fetch page content
             response_data = await self._fetch_page_content(url)
@@ -1352,86 +1706,37 @@ class UltimateTechDetector:
             
             # Run Pattern Matching detection
             if 'pattern' in engines:
-                logger.info("ENGINE_START: Pattern Matching detection")
-                pattern_start = time.time()
-                pattern_technologies = await self.pattern_matcher.detect_all_technologies(url, response_data)
-                pattern_time = time.time() - pattern_start
-                technologies.extend(pattern_technologies)
-                logger.info(f"ENGINE_COMPLETE: Pattern Matching - {len(pattern_technologies)} technologies in {pattern_time:.2f}s")
-                log_engine_status("Pattern Matching", "Completed", f"{len(pattern_technologies)} technologies")
-            
-            # Run WhatWeb detection
-            if 'whatweb' in engines:
-                logger.info("ENGINE_START: WhatWeb detection")
-                whatweb_start = time.time()
-                whatweb_technologies = await self.whatweb.analyze_url(url)
-                whatweb_time = time.time() - whatweb_start
-                technologies.extend(whatweb_technologies)
-                logger.info(f"ENGINE_COMPLETE: WhatWeb - {len(whatweb_technologies)} technologies in {whatweb_time:.2f}s")
-                log_engine_status("WhatWeb", "Completed", f"{len(whatweb_technologies)} technologies")
-            
-            # Run CMSeeK detection
-            if 'cmseek' in engines:
-                logger.info("ENGINE_START: CMSeeK detection")
-                cmseek_start = time.time()
-                cmseek_technologies = await self.cmseek.analyze_url(url)
-                cmseek_time = time.time() - cmseek_start
-                technologies.extend(cmseek_technologies)
-                logger.info(f"ENGINE_COMPLETE: CMSeeK - {len(cmseek_technologies)} technologies in {cmseek_time:.2f}s")
-                log_engine_status("CMSeeK", "Completed", f"{len(cmseek_technologies)} technologies")
-            
-            # Run WhatCMS.org API detection
-            if 'whatcms' in engines:
-                logger.info("ENGINE_START: WhatCMS.org API detection")
-                whatcms_start = time.time()
-                whatcms_technologies = await self.whatcms.analyze_url(url)
-                whatcms_time = time.time() - whatcms_start
-                technologies.extend(whatcms_technologies)
-                logger.info(f"ENGINE_COMPLETE: WhatCMS.org - {len(whatcms_technologies)} technologies in {whatcms_time:.2f}s")
-                log_engine_status("WhatCMS.org", "Completed", f"{len(whatcms_technologies)} technologies")
-            
-            # Run Wappalyzer detection
-            if 'wappalyzer' in engines:
-                logger.info("ENGINE_START: Wappalyzer detection")
-                wappalyzer_start = time.time()
-                wappalyzer_technologies = await self.wappalyzer.analyze_url(url)
-                wappalyzer_time = time.time() - wappalyzer_start
-                technologies.extend(wappalyzer_technologies)
-                logger.info(f"ENGINE_COMPLETE: Wappalyzer - {len(wappalyzer_technologies)} technologies in {wappalyzer_time:.2f}s")
-                log_engine_status("Wappalyzer", "Completed", f"{len(wappalyzer_technologies)} technologies")
+                technologies.extend(await self._run_engine(
+                    "Pattern Matching", self.pattern_matcher.detect_all_technologies(url, response_data)))
+            
+            # Collect WhatWeb, CMSeeK, WhatCMS.org and Wappalyzer results in engine order
+            for engine_technologies in await asyncio.gather(*external_tasks):
+                technologies.extend(engine_technologies)
             
             # Run additional pattern matching for 100% coverage
             if 'additional' in engines:
-                logger.info("ENGINE_START: Additional Patterns detection")
-                additional_start = time.time()
-                logger.debug(f"Response data keys: {list(response_data.keys())}")
-                logger.debug(f"CSS links: {len(response_data.get('css_links', []))}")
-                logger.debug(f"Image sources: {len(response_data.get('img_srcs', []))}")
-                additional_technologies = await self._detect_additional_patterns(url, response_data)
-                additional_time = time.time() - additional_start
-                logger.info(f"ENGINE_COMPLETE: Additional Patterns - {len(additional_technologies)} technologies in {additional_time:.2f}s")
-                log_engine_status("Additional Patterns", "Completed", f"{len(additional_technologies)} technologies")
-                technologies.extend(additional_technologies)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response data keys: %s", list(response_data.keys()))
+                    logger.debug("CSS links: %s", len(response_data.get('css_links', [])))
+                    logger.debug("Image sources: %s", len(response_data.get('img_srcs', [])))
+                technologies.extend(await self._run_engine(
+                    "Additional Patterns", self._detect_additional_patterns(url, response_data)))
             
             # Run deep analysis for comprehensive detection
             if 'deep' in engines:
-                logger.info("ENGINE_START: Deep Analysis detection")
-                deep_start = time.time()
-                deep_technologies = await self._run_deep_analysis(url, response_data)
-                deep_time = time.time() - deep_start
-                logger.info(f"ENGINE_COMPLETE: Deep Analysis - {len(deep_technologies)} technologies in {deep_time:.2f}s")
-                log_engine_status("Deep Analysis", "Completed", f"{len(deep_technologies)} technologies")
-                technologies.extend(deep_technologies)
+                technologies.extend(await self._run_engine(
+                    "Deep Analysis", self._run_deep_analysis(url, response_data)))
             
             # Calculate detection breakdown BEFORE deduplication
+            source_counts = Counter(map(_get_source, technologies))
             detection_breakdown = {
-                'pattern_matching': len([t for t in technologies if 'pattern' in t.source]),
-                'whatweb': len([t for t in technologies if t.source == 'whatweb']),
-                'cmseek': len([t for t in technologies if t.source == 'cmseek']),
-                'whatcms': len([t for t in technologies if t.source == 'whatcms']),
-                'wappalyzer': len([t for t in technologies if t.source == 'wappalyzer']),
-                'additional_patterns': len([t for t in technologies if t.source == 'additional_pattern']),
-                'deep_analysis': len([t for t in technologies if t.source == 'deep'])
+                'pattern_matching': sum(count for source, count in source_counts.items() if 'pattern' in source),
+                'whatweb': source_counts['whatweb'],
+                'cmseek': source_counts['cmseek'],
+                'whatcms': source_counts['whatcms'],
+                'wappalyzer': source_counts['wappalyzer'],
+                'additional_patterns': source_counts['additional_pattern'],
+                'deep_analysis': source_counts['deep']
             }
             
             # Deduplicate and merge all technologies
@@ -1441,56 +1746,68 @@ class UltimateTechDetector:
             min_confidence = options.get('min_confidence', 0)
             max_results = options.get('max_results', 200)
             
-            filtered_technologies = [
-                tech for tech in technologies 
-                if tech.confidence >= min_confidence
-            ][:max_results]
+            filtered_technologies = self._select_top_technologies(technologies, min_confidence, max_results)
+            
+            # Category and confidence summaries are optional for bulk runs
+            include_summary = options.get('include_summary', True)
+            if include_summary and filtered_technologies:
+                category_counts, confidence_distribution = self._summarize_technologies(filtered_technologies)
+            else:
+                category_counts = Counter()
+                confidence_distribution = {'high (80-100)': 0, 'medium (50-79)': 0, 'low (10-49)': 0}
             
-            analysis_time = time.time() - start_time
+            analysis_time = time.perf_counter() - start_time
             
             # Build result
+            metadata = {
+                'title': response_data.get('title', ''),
+                'description': response_data.get('description', ''),
+                'content_length': response_data.get('content_length', 0),
+                'response_time': response_data.get('response_time', 0),
+                'server': response_data.get('server', ''),
+                'total_technologies': len(filtered_technologies),
+                'dataset_utilization': f"{len(self.dataset_manager.all_technologies)} technologies available",
+                'detection_breakdown': detection_breakdown,
+                'performance_metrics': {
+                    'analysis_time_seconds': round(analysis_time, 2),
+                    'technologies_per_second': round(len(filtered_technologies) / analysis_time, 2) if analysis_time > 0 else 0
+                }
+            }
+            if include_summary:
+                metadata['categories_detected'] = len(category_counts)
+                metadata['confidence_distribution'] = confidence_distribution
+            
             result = AnalysisResult(
                 url=url,
                 final_url=response_data.get('final_url', url),
                 technologies=filtered_technologies,
                 analysis_time=analysis_time,
-                metadata={
-                    'title': response_data.get('title', ''),
-                    'description': response_data.get('description', ''),
-                    'content_length': response_data.get('content_length', 0),
-                    'response_time': response_data.get('response_time', 0),
-                    'server': response_data.get('server', ''),
-                    'total_technologies': len(filtered_technologies),
-                    'dataset_utilization': f"{len(self.dataset_manager.all_technologies)} technologies available",
-                    'categories_detected': len(set(tech.category for tech in filtered_technologies)),
-                    'confidence_distribution': self._get_confidence_distribution(filtered_technologies),
-                    'detection_breakdown': detection_breakdown,
-                    'performance_metrics': {
-                        'analysis_time_seconds': round(analysis_time, 2),
-                        'technologies_per_second': round(len(filtered_technologies) / analysis_time, 2) if analysis_time > 0 else 0
-                    }
-                },
+                metadata=metadata,
                 user_agents_tried=[response_data.get('user_agent', 'Unknown')],
                 successful_agent=response_data.get('user_agent', 'Unknown')
             )
             
             # Log comprehensive results
-            logger.info(f"ANALYSIS_COMPLETE: {url} - {len(filtered_technologies)} technologies in {result.analysis_time:.2f}s")
-            logger.info(f"DETECTION_BREAKDOWN: {detection_breakdown}")
-            logger.info(f"CATEGORIES_DETECTED: {len(set(tech.category for tech in filtered_technologies))}")
-            logger.info(f"CONFIDENCE_DISTRIBUTION: {self._get_confidence_distribution(filtered_technologies)}")
+            logger.info("ANALYSIS_COMPLETE: %s - %s technologies in %.2fs", url, len(filtered_technologies), result.analysis_time)
+            logger.info("DETECTION_BREAKDOWN: %s", detection_breakdown)
+            if include_summary:
+                logger.info("CATEGORIES_DETECTED: %s", len(category_counts))
+                logger.info("CONFIDENCE_DISTRIBUTION: %s", confidence_distribution)
             
             # Log completion
             engines_used = [engine for engine in engines if detection_breakdown.get(engine, 0) > 0]
             log_analysis_complete(url, len(filtered_technologies), result.analysis_time, engines_used)
             
+            if cache_key is not None:
+                self._store_cached_result(cache_key, result)
+            
             return result
             
         except Exception as e:
-            logger.error(f"ANALYSIS_FAILED: {url} - {str(e)}")
-            logger.error(f"ERROR_TRACEBACK: {traceback.format_exc()}")
+            logger.error("ANALYSIS_FAILED: %s - %s", url, e)
+            logger.error("ERROR_TRACEBACK: %s", traceback.format_exc())
             log_analysis_error(url, str(e))
-            analysis_time = time.time() - start_time
+            analysis_time = time.perf_counter() - start_time
             return AnalysisResult(
                 url=url,
                 final_url=url,
@@ -1498,15 +1815,133 @@ class UltimateTechDetector:
                 errors=[str(e)]
             )
         finally:
-            # Don't close session here - let it be reused
-            pass
+            # Don't close session here - let it be reused; only stop engines left running after a failure
+            for task in external_tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _run_engine(self, name: str, detection) -> List[DetectionResult]:
+        """Await a detection engine coroutine with start and completion logging"""
+        logger.info("ENGINE_START: %s detection", name)
+        engine_start = time.perf_counter()
+        engine_technologies = await detection
+        engine_time = time.perf_counter() - engine_start
+        logger.info("ENGINE_COMPLETE: %s - %s technologies in %.2fs", name, len(engine_technologies), engine_time)
+        log_engine_status(name, "Completed", f"{len(engine_technologies)} technologies")
+        return engine_technologies
+    
+    def _get_cached_result(self, cache_key: Tuple, ttl: float) -> Optional[AnalysisResult]:
+        """Return a copy of a cached analysis that is still within its TTL"""
+        entry = self.result_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at > ttl:
+            del self.result_cache[cache_key]
+            return None
+        
+        self.result_cache.move_to_end(cache_key)
+        return copy.deepcopy(result)
+    
+    def _store_cached_result(self, cache_key: Tuple, result: AnalysisResult):
+        """Cache an analysis result, evicting the least recently used entries"""
+        self.result_cache[cache_key] = (time.monotonic(), copy.deepcopy(result))
+        self.result_cache.move_to_end(cache_key)
+        while len(self.result_cache) > self.result_cache_size:
+            self.result_cache.popitem(last=False)
+    
+    async def analyze_urls(self, urls: List[str], options: Dict[str, Any] = None, engines: List[str] = None,
+                           concurrency: int = None) -> List[Any]:
+        """Analyze several URLs concurrently, sharing the HTTP session"""
+        if options is None:
+            options = {}
+        workers = concurrency if concurrency is not None else options.get('workers', 50)
+        delay = options.get('delay', 0)
+        semaphore = asyncio.Semaphore(max(1, workers))
+        
+        # One WhatWeb process serves the whole list instead of one process per URL
+        if 'whatweb' in (engines if engines is not None else DEFAULT_ENGINES):
+            self.whatweb.prefetch(urls)
+        
+        async def guarded(index: int, url: str):
+            async with semaphore:
+                if delay:
+                    await asyncio.sleep(delay)
+                try:
+                    return index, await self.analyze_url(url, options, engines)
+                except Exception as e:
+                    return index, e
+        
+        # Results keep the input order; unexpected failures are returned in place of their result
+        results = [None] * len(urls)
+        tasks = [asyncio.ensure_future(guarded(index, url)) for index, url in enumerate(urls)]
+        for completed, future in enumerate(asyncio.as_completed(tasks), 1):
+            index, result = await future
+            results[index] = result
+            logger.info("BATCH_PROGRESS: %s/%s - %s", completed, len(urls), urls[index])
+        
+        return results
+    
+    async def analyze_stream(self, urls: Iterable[str], options: Dict[str, Any] = None,
+                             engines: List[str] = None) -> AsyncIterator[AnalysisResult]:
+        """Analyze URLs from a (lazy) iterable with a bounded worker pool, yielding results as they complete"""
+        if options is None:
+            options = {}
+        workers = max(1, options.get('workers', 50))
+        delay = options.get('delay', 0)
+        url_queue = asyncio.Queue(maxsize=workers * 2)
+        result_queue = asyncio.Queue(maxsize=workers * 2)
+        
+        async def produce():
+            try:
+                for url in urls:
+                    await url_queue.put(url)
+            finally:
+                # One stop marker per worker, even if reading the URLs failed
+                for _ in range(workers):
+                    await url_queue.put(None)
+        
+        async def work():
+            while True:
+                url = await url_queue.get()
+                if url is None:
+                    break
+                if delay:
+                    await asyncio.sleep(delay)
+                try:
+                    result = await self.analyze_url(url, options, engines)
+                except Exception as e:
+                    result = AnalysisResult(url=url, final_url=url, errors=[str(e)])
+                await result_queue.put(result)
+            await result_queue.put(None)
+        
+        producer = asyncio.ensure_future(produce())
+        worker_tasks = [asyncio.ensure_future(work()) for _ in range(workers)]
+        try:
+            running = workers
+            completed = 0
+            while running:
+                result = await result_queue.get()
+                if result is None:
+                    running -= 1
+                    continue
+                completed += 1
+                logger.info("BATCH_PROGRESS: %s completed - %s", completed, result.url)
+                yield result
+            # Surface errors from reading the URL source
+            await producer
+        finally:
+            for task in [producer] + worker_tasks:
+                if not task.done():
+                    task.cancel()
     
     async def _fetch_page_content(self, url: str) -> Dict[str, Any]:
         """Fetch page content and extract relevant data"""
         try:
             # Ensure session is available
             if self.session is None or self.session.closed:
-                self.session = aiohttp.ClientSession()
+                self.session = aiohttp.ClientSession(connector=self.connector, connector_owner=self.connector is None)
             
             async with self.session.get(url) as response:
                 content = await response.text()
@@ -1528,19 +1963,17 @@ class UltimateTechDetector:
                 for name, content_val in meta_matches:
                     meta_tags[name.lower()] = content_val
                 
-                # Extract headers
-                headers = {}
+                # Extract headers (multimap so repeated headers are not dropped)
+                headers = CIMultiDict()
                 for header_name, header_value in response.headers.items():
-                    headers[header_name.lower()] = header_value
+                    headers.add(header_name.lower(), header_value)
                 
-                # Extract cookies
-                cookies = {}
-                if 'set-cookie' in response.headers:
-                    cookie_header = response.headers['set-cookie']
-                    for cookie in cookie_header.split(','):
-                        if '=' in cookie:
-                            name, value = cookie.split('=', 1)
-                            cookies[name.strip()] = value.strip()
+                # Extract cookies (aiohttp parses every Set-Cookie header into a SimpleCookie once)
+                cookies = {name: morsel.value for name, morsel in response.cookies.items()}
+                
+                # Canonical "name: value" lines for the fused header/meta pattern scan
+                kv_lines = [('headers', f"{name}: {value}") for name, value in headers.items()]
+                kv_lines.extend(('meta', f"{name}: {value}") for name, value in meta_tags.items())
                 
                 # Extract additional patterns for comprehensive detection
                 css_links = re.findall(r'<link[^>]*href=["\']([^"\']*\.css[^"\']*)["\']', content, re.IGNORECASE)
@@ -1556,6 +1989,7 @@ class UltimateTechDetector:
                     'meta_tags': meta_tags,
                     'headers': headers,
                     'cookies': cookies,
+                    'kv_lines': kv_lines,
                     'final_url': str(response.url),
                     'content_length': len(content),
                     'response_time': response.headers.get('X-Response-Time', '0'),
@@ -1564,7 +1998,7 @@ class UltimateTechDetector:
                 }
                 
         except Exception as e:
-            logger.error(f"Failed to fetch page content: {e}")
+            logger.error("Failed to fetch page content: %s", e)
             return {
                 'content': '',
                 'title': '',
@@ -1573,8 +2007,9 @@ class UltimateTechDetector:
                 'css_links': [],
                 'img_srcs': [],
                 'meta_tags': {},
-                'headers': {},
+                'headers': CIMultiDict(),
                 'cookies': {},
+                'kv_lines': [],
                 'final_url': url,
                 'content_length': 0,
                 'response_time': '0',
@@ -1582,41 +2017,76 @@ class UltimateTechDetector:
                 'user_agent': 'UltimateTechDetector/1.0'
             }
     
+    def _select_top_technologies(self, technologies: List[DetectionResult], min_confidence: int,
+                                 max_results: int) -> List[DetectionResult]:
+        """Filter by confidence and keep the most confident results, highest first"""
+        # Large lists are ranked in numpy with a stable sort, matching the pure Python order
+        if NUMPY_AVAILABLE and len(technologies) > 1000:
+            confidences = np.fromiter(map(_get_confidence, technologies), dtype=np.float64, count=len(technologies))
+            indices = np.flatnonzero(confidences >= min_confidence)
+            ranked = indices[np.argsort(-confidences[indices], kind='stable')][:max_results]
+            return [technologies[index] for index in ranked.tolist()]
+        
+        # Nothing to filter when no threshold is set (deduplication already returns a fresh list)
+        if min_confidence > 0:
+            filtered_technologies = [
+                tech for tech in technologies 
+                if tech.confidence >= min_confidence
+            ]
+        else:
+            filtered_technologies = technologies
+        
+        # Keep the most confident results; a bounded heap avoids sorting everything when truncating
+        if len(filtered_technologies) > max_results:
+            filtered_technologies = heapq.nlargest(max_results, filtered_technologies, key=_get_confidence)
+        elif len(filtered_technologies) > 1:
+            filtered_technologies.sort(key=_get_confidence, reverse=True)
+        
+        return filtered_technologies
+    
     def _get_confidence_distribution(self, technologies: List[DetectionResult]) -> Dict[str, int]:
         """Get confidence distribution statistics"""
-        distribution = {
-            'high (80-100)': 0,
-            'medium (50-79)': 0,
-            'low (10-49)': 0
-        }
+        return self._summarize_technologies(technologies)[1]
+    
+    def _summarize_technologies(self, technologies: List[DetectionResult]) -> Tuple[Counter, Dict[str, int]]:
+        """Count categories and confidence bands in a single pass"""
+        category_counts = Counter()
+        high = medium = low = 0
         
-        for tech in technologies:
-            if tech.confidence >= 80:
-                distribution['high (80-100)'] += 1
-            elif tech.confidence >= 50:
-                distribution['medium (50-79)'] += 1
+        for category, confidence in map(_get_category_and_confidence, technologies):
+            category_counts[category] += 1
+            if confidence >= 80:
+                high += 1
+            elif confidence >= 50:
+                medium += 1
             else:
-                distribution['low (10-49)'] += 1
+                low += 1
         
-        return distribution
+        return category_counts, {
+            'high (80-100)': high,
+            'medium (50-79)': medium,
+            'low (10-49)': low
+        }
     
     async def _detect_additional_patterns(self, url: str, response_data: Dict[str, Any]) -> List[DetectionResult]:
         """Detect additional patterns for 100% coverage"""
+        detected_at = time.time()
         detections = []
-        logger.info(f"Additional patterns: Starting analysis for {url}")
-        logger.info(f"Response data keys: {list(response_data.keys())}")
+        logger.info("Additional patterns: Starting analysis for %s", url)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Response data keys: %s", list(response_data.keys()))
         
         # CSS pattern detection
         css_links = response_data.get('css_links', [])
-        logger.info(f"Additional patterns: Checking {len(css_links)} CSS links for patterns")
+        logger.info("Additional patterns: Checking %s CSS links for patterns", len(css_links))
         for css_link in css_links:
             # Check all pattern types for CSS links
             for pattern_type in ['scripts', 'urls', 'html']:
                 if pattern_type in self.dataset_manager.pattern_database:
-                    logger.info(f"Additional patterns: Checking {len(self.dataset_manager.pattern_database[pattern_type])} {pattern_type} patterns")
+                    logger.info("Additional patterns: Checking %s %s patterns", len(self.dataset_manager.pattern_database[pattern_type]), pattern_type)
                     for pattern in self.dataset_manager.pattern_database[pattern_type]:
                         try:
-                            if re.search(pattern, css_link, re.IGNORECASE):
+                            if self.pattern_matcher.search(pattern, css_link, re.IGNORECASE):
                                 for match in self.dataset_manager.pattern_database[pattern_type][pattern]:
                                     tech_name = match['technology']
                                     tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -1634,10 +2104,10 @@ class UltimateTechDetector:
                                         source='additional_pattern',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Additional pattern detected: {tech_name} from CSS link")
+                                    logger.info("Additional pattern detected: %s from CSS link", tech_name)
                         except re.error:
                             continue
             
@@ -1654,7 +2124,7 @@ class UltimateTechDetector:
             }
             
             for framework, pattern in css_frameworks.items():
-                if re.search(pattern, css_link, re.IGNORECASE):
+                if self.pattern_matcher.search(pattern, css_link, re.IGNORECASE):
                     detection = DetectionResult(
                         name=framework,
                         confidence=70,
@@ -1668,21 +2138,21 @@ class UltimateTechDetector:
                         source='additional_pattern',
                         website='',
                         description=f'{framework} CSS framework detected',
-                        detection_time=time.time()
+                        detection_time=detected_at
                     )
                     detections.append(detection)
-                    logger.info(f"Additional pattern detected: {framework} from CSS link")
+                    logger.info("Additional pattern detected: %s from CSS link", framework)
         
         # Image source pattern detection
         img_srcs = response_data.get('img_srcs', [])
-        logger.info(f"Additional patterns: Checking {len(img_srcs)} image sources for patterns")
+        logger.info("Additional patterns: Checking %s image sources for patterns", len(img_srcs))
         for img_src in img_srcs:
             # Check all pattern types for image sources
             for pattern_type in ['scripts', 'urls', 'html']:
                 if pattern_type in self.dataset_manager.pattern_database:
                     for pattern in self.dataset_manager.pattern_database[pattern_type]:
                         try:
-                            if re.search(pattern, img_src, re.IGNORECASE):
+                            if self.pattern_matcher.search(pattern, img_src, re.IGNORECASE):
                                 for match in self.dataset_manager.pattern_database[pattern_type][pattern]:
                                     tech_name = match['technology']
                                     tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -1700,10 +2170,10 @@ class UltimateTechDetector:
                                         source='additional_pattern',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Additional pattern detected: {tech_name} from image source")
+                                    logger.info("Additional pattern detected: %s from image source", tech_name)
                         except re.error:
                             continue
             
@@ -1747,7 +2217,7 @@ class UltimateTechDetector:
                     for tech_name, patterns in tech_patterns.items():
                         for pattern in patterns:
                             try:
-                                if re.search(pattern, content_item, re.IGNORECASE):
+                                if self.pattern_matcher.search(pattern, content_item, re.IGNORECASE):
                                     detection = DetectionResult(
                                         name=tech_name,
                                         confidence=55,
@@ -1761,16 +2231,16 @@ class UltimateTechDetector:
                                         source='additional_pattern',
                                         website='',
                                         description=f'Detected from additional pattern matching',
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Additional pattern detected: {tech_name} from content")
+                                    logger.info("Additional pattern detected: %s from content", tech_name)
                                     break  # Only add once per technology
                             except re.error:
                                 continue
             
             for service, pattern in cdn_patterns.items():
-                if re.search(pattern, img_src, re.IGNORECASE):
+                if self.pattern_matcher.search(pattern, img_src, re.IGNORECASE):
                     detection = DetectionResult(
                         name=service,
                         confidence=60,
@@ -1784,14 +2254,14 @@ class UltimateTechDetector:
                         source='additional_pattern',
                         website='',
                         description=f'{service} CDN service detected',
-                        detection_time=time.time()
+                        detection_time=detected_at
                     )
                     detections.append(detection)
-                    logger.info(f"Additional pattern detected: {service} from image source")
+                    logger.info("Additional pattern detected: %s from image source", service)
         
         # Cookie pattern detection
         cookies = response_data.get('cookies', {})
-        logger.info(f"Checking {len(cookies)} cookies for patterns")
+        logger.info("Checking %s cookies for patterns", len(cookies))
         for cookie_name, cookie_value in cookies.items():
             cookie_pattern = f"{cookie_name}={cookie_value}"
             # Check both exact match and pattern matching
@@ -1814,17 +2284,17 @@ class UltimateTechDetector:
                             source='additional_pattern',
                             website=tech_data.get('website'),
                             description=tech_data.get('description'),
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         detections.append(detection)
-                        logger.info(f"Additional pattern detected: {tech_name} from cookie")
+                        logger.info("Additional pattern detected: %s from cookie", tech_name)
             
             # Also check cookie name and value separately
             for pattern_type in ['scripts', 'urls', 'html']:
                 if pattern_type in self.dataset_manager.pattern_database:
                     for pattern in self.dataset_manager.pattern_database[pattern_type]:
                         try:
-                            if re.search(pattern, cookie_name, re.IGNORECASE) or re.search(pattern, cookie_value, re.IGNORECASE):
+                            if self.pattern_matcher.search(pattern, cookie_name, re.IGNORECASE) or self.pattern_matcher.search(pattern, cookie_value, re.IGNORECASE):
                                 for match in self.dataset_manager.pattern_database[pattern_type][pattern]:
                                     tech_name = match['technology']
                                     tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -1842,10 +2312,10 @@ class UltimateTechDetector:
                                         source='additional_pattern',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Additional pattern detected: {tech_name} from cookie pattern")
+                                    logger.info("Additional pattern detected: %s from cookie pattern", tech_name)
                         except re.error:
                             continue
         
@@ -1853,21 +2323,23 @@ class UltimateTechDetector:
     
     async def _run_deep_analysis(self, url: str, response_data: Dict[str, Any]) -> List[DetectionResult]:
         """Run deep analysis for comprehensive technology detection"""
+        detected_at = time.time()
         detections = []
         
         try:
             logger.info("Starting deep analysis...")
-            logger.info(f"Deep analysis: Response data keys: {list(response_data.keys())}")
-            logger.info(f"Deep analysis: Pattern database keys: {list(self.dataset_manager.pattern_database.keys())}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Deep analysis: Response data keys: %s", list(response_data.keys()))
+            logger.info("Deep analysis: Pattern database keys: %s", list(self.dataset_manager.pattern_database.keys()))
             
             if 'headers' in self.dataset_manager.pattern_database:
-                logger.info(f"Deep analysis: Headers patterns count: {len(self.dataset_manager.pattern_database['headers'])}")
+                logger.info("Deep analysis: Headers patterns count: %s", len(self.dataset_manager.pattern_database['headers']))
             if 'html' in self.dataset_manager.pattern_database:
-                logger.info(f"Deep analysis: HTML patterns count: {len(self.dataset_manager.pattern_database['html'])}")
+                logger.info("Deep analysis: HTML patterns count: %s", len(self.dataset_manager.pattern_database['html']))
             
             # Deep header analysis
             headers = response_data.get('headers', {})
-            logger.info(f"Deep analysis: Checking {len(headers)} headers")
+            logger.info("Deep analysis: Checking %s headers", len(headers))
             for header_name, header_value in headers.items():
                 header_text = f"{header_name}: {header_value}"
                 
@@ -1875,7 +2347,7 @@ class UltimateTechDetector:
                 if 'headers' in self.dataset_manager.pattern_database:
                     for pattern in self.dataset_manager.pattern_database['headers']:
                         try:
-                            if re.search(pattern, header_text, re.IGNORECASE):
+                            if self.pattern_matcher.search(pattern, header_text, re.IGNORECASE):
                                 for match in self.dataset_manager.pattern_database['headers'][pattern]:
                                     tech_name = match['technology']
                                     tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -1894,10 +2366,10 @@ class UltimateTechDetector:
                                         source='deep',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Deep analysis detected: {tech_name} from header")
+                                    logger.info("Deep analysis detected: %s from header", tech_name)
                         except re.error:
                             continue
             
@@ -1920,7 +2392,7 @@ class UltimateTechDetector:
             for header_name, header_value in headers.items():
                 header_text = f"{header_name}: {header_value}"
                 for server, pattern in server_patterns.items():
-                    if re.search(pattern, header_text, re.IGNORECASE):
+                    if self.pattern_matcher.search(pattern, header_text, re.IGNORECASE):
                         detection = DetectionResult(
                             name=server,
                             confidence=75,
@@ -1934,20 +2406,20 @@ class UltimateTechDetector:
                             source='deep',
                             website='',
                             description=f'{server} server technology detected',
-                            detection_time=time.time()
+                            detection_time=detected_at
                         )
                         detections.append(detection)
-                        logger.info(f"Deep analysis detected: {server} from header")
+                        logger.info("Deep analysis detected: %s from header", server)
             
             # Deep HTML content analysis
             html_content = response_data.get('content', '')
-            logger.info(f"Deep analysis: Checking HTML content ({len(html_content)} chars)")
+            logger.info("Deep analysis: Checking HTML content (%s chars)", len(html_content))
             if html_content:
                 # Use pattern database for HTML analysis
                 if 'html' in self.dataset_manager.pattern_database:
                     for pattern in self.dataset_manager.pattern_database['html']:
                         try:
-                            if re.search(pattern, html_content, re.IGNORECASE | re.DOTALL):
+                            if self.pattern_matcher.search(pattern, html_content, re.IGNORECASE | re.DOTALL):
                                 for match in self.dataset_manager.pattern_database['html'][pattern]:
                                     tech_name = match['technology']
                                     tech_data = self.dataset_manager.all_technologies.get(tech_name, {})
@@ -1966,10 +2438,10 @@ class UltimateTechDetector:
                                         source='deep',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Deep analysis detected: {tech_name} from HTML pattern")
+                                    logger.info("Deep analysis detected: %s from HTML pattern", tech_name)
                         except re.error:
                             continue
                 
@@ -1992,7 +2464,7 @@ class UltimateTechDetector:
                 for tech_name, patterns in common_patterns.items():
                     for pattern in patterns:
                         try:
-                            if re.search(pattern, html_content, re.IGNORECASE):
+                            if self.pattern_matcher.search(pattern, html_content, re.IGNORECASE):
                                 detection = DetectionResult(
                                     name=tech_name,
                                     confidence=60,
@@ -2007,10 +2479,10 @@ class UltimateTechDetector:
                                     source='deep',
                                     website='',
                                     description=f'Detected from HTML content pattern',
-                                    detection_time=time.time()
+                                    detection_time=detected_at
                                 )
                                 detections.append(detection)
-                                logger.info(f"Deep analysis detected: {tech_name} from HTML pattern")
+                                logger.info("Deep analysis detected: %s from HTML pattern", tech_name)
                                 break  # Only add once per technology
                         except re.error:
                             continue
@@ -2036,10 +2508,10 @@ class UltimateTechDetector:
                                         source='deep',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
-                                    logger.info(f"Deep analysis detected: {tech_name} from HTML content")
+                                    logger.info("Deep analysis detected: %s from HTML content", tech_name)
                             except re.error:
                                 continue
             
@@ -2050,7 +2522,7 @@ class UltimateTechDetector:
                     if 'scripts' in tech_data:
                         for pattern in tech_data['scripts']:
                             try:
-                                if re.search(pattern, script_url, re.IGNORECASE):
+                                if self.pattern_matcher.search(pattern, script_url, re.IGNORECASE):
                                     detection = DetectionResult(
                                         name=tech_name,
                                         confidence=80,
@@ -2065,7 +2537,7 @@ class UltimateTechDetector:
                                         source='deep',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
                             except re.error:
@@ -2078,7 +2550,7 @@ class UltimateTechDetector:
                     if 'meta' in tech_data:
                         for pattern in tech_data['meta']:
                             try:
-                                if re.search(pattern, f"{meta_name}: {meta_content}", re.IGNORECASE):
+                                if self.pattern_matcher.search(pattern, f"{meta_name}: {meta_content}", re.IGNORECASE):
                                     detection = DetectionResult(
                                         name=tech_name,
                                         confidence=70,
@@ -2093,16 +2565,16 @@ class UltimateTechDetector:
                                         source='deep',
                                         website=tech_data.get('website'),
                                         description=tech_data.get('description'),
-                                        detection_time=time.time()
+                                        detection_time=detected_at
                                     )
                                     detections.append(detection)
                             except re.error:
                                 continue
             
-            logger.info(f"Deep analysis completed: {len(detections)} technologies detected")
+            logger.info("Deep analysis completed: %s technologies detected", len(detections))
             
         except Exception as e:
-            logger.error(f"Deep analysis failed: {e}")
+            logger.error("Deep analysis failed: %s", e)
         
         return detections
     
@@ -2124,12 +2596,63 @@ class UltimateTechDetector:
         
         return list(tech_dict.values())
 
+def _dumps_result(result: AnalysisResult) -> bytes:
+    """Serialize an analysis result to indented UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        # orjson serializes the result dataclasses natively, in field order
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    return json.dumps(result.to_dict(), indent=2, ensure_ascii=False).encode('utf-8')
+
+def _read_batch_urls(path: str):
+    """Yield URLs from a batch file line by line, skipping blanks and comments"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith('#'):
+                yield url
+
+async def _write_json_output(results: AsyncIterator[AnalysisResult], stream, as_list: bool):
+    """Write analysis results as JSON one result at a time, as they arrive"""
+    if not as_list:
+        async for result in results:
+            stream.write(_dumps_result(result))
+            stream.write(b'\n')
+        return
+    
+    stream.write(b'[\n')
+    first = True
+    async for result in results:
+        if not first:
+            stream.write(b',\n')
+        first = False
+        stream.write(_dumps_result(result))
+        stream.flush()
+    stream.write(b'\n]\n')
+
+async def _write_text_output(results: AsyncIterator[AnalysisResult]):
+    """Write analysis results as plain text, as they arrive"""
+    async for result in results:
+        lines = [
+            f"Analysis Results for {result.url}",
+            f"Final URL: {result.final_url}",
+            f"Analysis Time: {result.analysis_time:.2f}s",
+            f"Technologies Detected: {len(result.technologies)}",
+            f"Categories: {result.metadata.get('categories_detected', 0)}",
+            "\nTechnologies:"
+        ]
+        lines.extend(f"  {tech.name} ({tech.category}) - {tech.confidence}% confidence" for tech in result.technologies)
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+
 async def main():
     """Main function for command line usage"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Ultimate Web Technology Detection System')
-    parser.add_argument('url', help='URL to analyze')
+    parser.add_argument('url', nargs='?', help='URL to analyze')
+    parser.add_argument('--batch', help='File with one URL per line to analyze')
+    parser.add_argument('--workers', type=int, default=5, help='Concurrent analyses in batch mode')
+    parser.add_argument('--delay', type=float, default=0.1, help='Delay in seconds before each batch analysis')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--output', '-o', choices=['json', 'text'], default='json', help='Output format')
     parser.add_argument('--deep', action='store_true', help='Enable deep detection mode')
@@ -2137,13 +2660,22 @@ async def main():
     parser.add_argument('--min-confidence', type=int, default=0, help='Minimum confidence threshold')
     parser.add_argument('--timeout', type=int, default=30, help='Request timeout in seconds')
     parser.add_argument('--save-report', help='Save report to file')
+    parser.add_argument('--no-summary', action='store_true', help='Skip category and confidence summaries')
+    parser.add_argument('--cache', action='store_true', help='Reuse results for repeated URLs')
+    parser.add_argument('--cache-ttl', type=int, default=3600, help='Result cache lifetime in seconds')
     
     args = parser.parse_args()
+    if not args.url and not args.batch:
+        parser.error('a URL or --batch file is required')
     
-    # Configure logging level
+    # Configure logging handlers and level
+    configure_logging()
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # Blocking engine calls (subprocesses, WhatCMS API) run on the default executor
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max(32, args.workers * 2)))
+    
     # Initialize detector
     detector = UltimateTechDetector()
     
@@ -2151,57 +2683,37 @@ async def main():
     options = {
         'min_confidence': args.min_confidence,
         'max_results': args.max_results,
-        'timeout': args.timeout
+        'timeout': args.timeout,
+        'cache': args.cache,
+        'cache_ttl': args.cache_ttl,
+        'workers': args.workers,
+        'delay': args.delay,
+        'include_summary': not args.no_summary
     }
+    options['analyze_options'] = AnalyzeOptions.from_options(options)
     
-    result = await detector.analyze_url(args.url, options)
-    
-    # Output results
-    if args.output == 'json':
-        output_data = {
-            'url': result.url,
-            'final_url': result.final_url,
-            'technologies': [
-                {
-                    'name': tech.name,
-                    'confidence': tech.confidence,
-                    'category': tech.category,
-                    'versions': tech.versions,
-                    'evidence': tech.evidence,
-                    'source': tech.source,
-                    'website': tech.website,
-                    'description': tech.description,
-                    'saas': tech.saas,
-                    'oss': tech.oss,
-                    'user_agent_used': tech.user_agent_used,
-                    'detection_time': tech.detection_time
-                }
-                for tech in result.technologies
-            ],
-            'analysis_time': result.analysis_time,
-            'metadata': result.metadata,
-            'errors': result.errors,
-            'warnings': result.warnings,
-            'user_agents_tried': result.user_agents_tried,
-            'successful_agent': result.successful_agent
-        }
-        
-        if args.save_report:
-            with open(args.save_report, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"Report saved to {args.save_report}")
-        else:
-            print(json.dumps(output_data, indent=2, ensure_ascii=False))
-    
-    else:  # text output
-        print(f"Analysis Results for {result.url}")
-        print(f"Final URL: {result.final_url}")
-        print(f"Analysis Time: {result.analysis_time:.2f}s")
-        print(f"Technologies Detected: {len(result.technologies)}")
-        print(f"Categories: {result.metadata.get('categories_detected', 0)}")
-        print("\nTechnologies:")
-        for tech in result.technologies:
-            print(f"  {tech.name} ({tech.category}) - {tech.confidence}% confidence")
+    async def single_result():
+        yield await detector.analyze_url(args.url, options)
+    
+    # Batch URLs are read lazily and results are written as each analysis completes
+    if args.batch:
+        results = detector.analyze_stream(_read_batch_urls(args.batch), options)
+    else:
+        results = single_result()
+    
+    try:
+        if args.output == 'json':
+            if args.save_report:
+                with open(args.save_report, 'wb') as f:
+                    await _write_json_output(results, f, bool(args.batch))
+                print(f"Report saved to {args.save_report}")
+            else:
+                await _write_json_output(results, sys.stdout.buffer, bool(args.batch))
+                sys.stdout.buffer.flush()
+        else:  # text output
+            await _write_text_output(results)
+    finally:
+        await detector.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    (uvloop.run if UVLOOP_AVAILABLE else asyncio.run)(main())